@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Spine AI 파이프라인 벤치마크
+
+합성 로스터와 스텁 SD 서버로 실제 SD WebUI 없이 파이프라인 처리량을 측정한다.
+
+- pipeline: batch_generate.py 전체 실행 (처리량, 스테이지별 지연 백분위수, 최대 RSS)
+- isolated: 각 스테이지 스크립트를 준비된 입력으로 단독 반복 실행
+
+사용법:
+    python run_bench.py --count 50 --latency 0.2 --output results.json
+    python run_bench.py --count 50 --output new.json --compare baseline.json --threshold 0.15
+
+스테이지 실패 횟수도 지표(*.failures)로 남기며, 실패가 있거나 기준에 있던 지표가 빠지면 실패로 끝난다.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from stub_sd_server import start_server  # noqa: E402
+from synthetic_roster import iter_synthetic_characters, write_roster  # noqa: E402
+from telemetry import load_records, percentile, run_measured, summarize  # noqa: E402
+
+console = Console()
+
+# 단독 실행 스테이지 (이름, 스크립트)
+ISOLATED_STAGES = [
+    ("illustration", "gen_illustration.py"),
+    ("split", "split_parts.py"),
+    ("rig", "rig_character.py"),
+    ("animate", "animate_character.py"),
+]
+
+# 다르면 기준과 직접 비교할 수 없는 실행 조건
+COMPARABLE_META = ("count", "latency", "workers", "image_size")
+
+
+def _metric(value: float, unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def bench_pipeline(work_dir: Path, sd_url: str, count: int, seed: int,
+                   workers: int) -> Dict[str, Dict[str, Any]]:
+    """batch_generate 전체 실행 측정"""
+    roster_path = write_roster(work_dir / "roster.jsonl", count, seed)
+    output_dir = work_dir / "pipeline"
+    telemetry_path = work_dir / "pipeline.jsonl"
+
+    cmd = [sys.executable, str(SCRIPTS_DIR / "batch_generate.py"),
+           "--input", str(roster_path), "--output", str(output_dir),
+           "--telemetry", str(telemetry_path)]
+    if workers > 1:
+        cmd += ["--queue", str(work_dir / "queue.db"), "--workers", str(workers),
+                "--poll-interval", "0.1"]
+
+    env = dict(os.environ, SD_API_URL=sd_url, SD_API_RETRIES="0")
+    started = time.perf_counter()
+    subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   check=True)
+    wall = time.perf_counter() - started
+
+    records = load_records(telemetry_path)
+    metrics = {
+        "pipeline.wall_time": _metric(wall, "s"),
+        "pipeline.throughput": _metric(count / wall if wall else 0.0, "chars/s", "higher"),
+    }
+    for stage, stats in summarize(records).items():
+        metrics[f"pipeline.{stage}.failures"] = _metric(stats["failures"], "count")
+        if stats["failures"]:
+            console.print(f"[yellow]{stage}: 실패 {stats['failures']}회[/yellow]")
+        if not stats["wall_time"]["count"]:
+            continue
+        metrics[f"pipeline.{stage}.p50"] = _metric(stats["wall_time"]["p50"], "s")
+        metrics[f"pipeline.{stage}.p95"] = _metric(stats["wall_time"]["p95"], "s")
+        metrics[f"pipeline.{stage}.max_rss"] = _metric(stats["max_rss_bytes"]["max"], "bytes")
+    return metrics
+
+
+def _stage_args(stage: str, char_dir: Path, output_root: Path) -> List[str]:
+    """스테이지별 입력 인자"""
+    if stage == "illustration":
+        return ["--config", str(char_dir / "config.json"), "--output", str(output_root)]
+    if stage == "split":
+        return ["--input", str(char_dir / "illustration.png"),
+                "--output", str(char_dir / "parts")]
+    if stage == "rig":
+        return ["--input", str(char_dir / "parts"), "--output", str(char_dir / "spine")]
+    return ["--input", str(char_dir / "spine"), "--preset", "combat"]
+
+
+def bench_isolated(work_dir: Path, sd_url: str, repeat: int,
+                   seed: int) -> Dict[str, Dict[str, Any]]:
+    """스테이지 단독 반복 실행 측정 (앞 스테이지 출력을 다음 입력으로 사용)"""
+    output_root = work_dir / "isolated"
+    character = next(iter_synthetic_characters(1, seed))
+    char_dir = output_root / character["character_id"]
+    char_dir.mkdir(parents=True, exist_ok=True)
+    with open(char_dir / "config.json", "w", encoding="utf-8") as f:
+        json.dump(character, f, indent=2, ensure_ascii=False)
+
+    env = dict(os.environ, SD_API_URL=sd_url, SD_API_RETRIES="0")
+    metrics = {}
+    for stage, script in ISOLATED_STAGES:
+        walls, rss = [], []
+        failures = 0
+        for _ in range(repeat):
+            result = run_measured([sys.executable, str(SCRIPTS_DIR / script)]
+                                  + _stage_args(stage, char_dir, output_root),
+                                  timeout=300, env=env)
+            if result["returncode"] != 0:
+                console.print(f"[red]{stage} 실패:\n{result['stderr'][-2000:]}[/red]")
+                failures += 1
+                break
+            walls.append(result["wall_time"])
+            rss.append(result.get("max_rss_bytes", 0))
+        metrics[f"isolated.{stage}.failures"] = _metric(failures, "count")
+        if not walls:
+            continue
+        metrics[f"isolated.{stage}.p50"] = _metric(percentile(walls, 50), "s")
+        metrics[f"isolated.{stage}.p95"] = _metric(percentile(walls, 95), "s")
+        metrics[f"isolated.{stage}.max_rss"] = _metric(max(rss), "bytes")
+    return metrics
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """기준 결과 대비 변화율 계산, 회귀 여부 표시
+
+    기준에 있는데 현재 결과에 없는 지표(스테이지가 실패해 측정 못 함)도 회귀로 본다.
+    """
+    rows = []
+    for name, base in baseline.get("metrics", {}).items():
+        current = results["metrics"].get(name)
+        if current is None:
+            rows.append({"metric": name, "baseline": base["value"], "current": None,
+                         "unit": base["unit"], "change": None, "regression": True})
+            continue
+        if base["value"]:
+            change = (current["value"] - base["value"]) / base["value"]
+        else:
+            # 기준이 0인 지표 (실패 횟수 등)는 조금이라도 늘면 회귀
+            change = 0.0 if current["value"] == base["value"] else float("inf")
+            if current["value"] < base["value"]:
+                change = -change
+        worse = change if current["better"] == "lower" else -change
+        rows.append({
+            "metric": name,
+            "baseline": base["value"],
+            "current": current["value"],
+            "unit": current["unit"],
+            "change": change,
+            "regression": worse > threshold,
+        })
+    return rows
+
+
+def meta_mismatches(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """기준과 다른 실행 조건"""
+    base_meta = baseline.get("meta", {})
+    return [f"{key}: {base_meta.get(key)} → {results['meta'].get(key)}"
+            for key in COMPARABLE_META if base_meta.get(key) != results["meta"].get(key)]
+
+
+def failed_metrics(results: Dict[str, Any]) -> List[str]:
+    """실패 횟수가 0이 아닌 지표"""
+    return [name for name, metric in results["metrics"].items()
+            if name.endswith(".failures") and metric["value"]]
+
+
+def _format(value: Optional[float], unit: str) -> str:
+    if value is None:
+        return "없음"
+    if unit == "count":
+        return f"{value:.0f}"
+    if unit == "bytes":
+        return f"{value / (1024 * 1024):.1f}MB"
+    return f"{value:.3f}{unit}"
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    table = Table(title="벤치마크 결과")
+    table.add_column("지표")
+    table.add_column("값", justify="right")
+    for name, metric in results["metrics"].items():
+        table.add_row(name, _format(metric["value"], metric["unit"]))
+    console.print(table)
+
+
+def print_comparison(rows: List[Dict[str, Any]], threshold: float) -> None:
+    table = Table(title=f"기준 대비 (허용 {threshold:.0%})")
+    table.add_column("지표")
+    table.add_column("기준", justify="right")
+    table.add_column("현재", justify="right")
+    table.add_column("변화", justify="right")
+    for row in rows:
+        style = "red" if row["regression"] else None
+        change = "측정 안 됨" if row["change"] is None else f"{row['change']:+.1%}"
+        table.add_row(row["metric"], _format(row["baseline"], row["unit"]),
+                      _format(row["current"], row["unit"]), change, style=style)
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 벤치마크")
+    parser.add_argument("--count", type=int, default=20, help="합성 캐릭터 수")
+    parser.add_argument("--seed", type=int, default=0, help="로스터 시드")
+    parser.add_argument("--latency", type=float, default=0.0, help="스텁 SD 응답 지연(초)")
+    parser.add_argument("--image-size", type=int, default=512,
+                        help="스텁 SD 이미지 최대 변 길이")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="파이프라인 워커 수 (2 이상이면 작업 큐 사용)")
+    parser.add_argument("--repeat", type=int, default=5, help="단독 스테이지 반복 횟수")
+    parser.add_argument("--mode", type=str, default="all",
+                        choices=["all", "pipeline", "isolated"], help="측정 대상")
+    parser.add_argument("--output", type=str, default="bench_results.json",
+                        help="결과 저장 경로")
+    parser.add_argument("--compare", type=str, help="비교할 기준 결과 파일")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="회귀로 판단할 악화 비율 (0.1 = 10%%)")
+    parser.add_argument("--keep", action="store_true", help="작업 디렉토리 보존")
+    args = parser.parse_args()
+
+    server, sd_url = start_server(latency=args.latency, max_size=args.image_size)
+    work_dir = Path(tempfile.mkdtemp(prefix="spine_bench_"))
+    console.print(f"[blue]스텁 SD: {sd_url}, 작업 경로: {work_dir}[/blue]")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "count": args.count,
+            "seed": args.seed,
+            "latency": args.latency,
+            "image_size": args.image_size,
+            "workers": args.workers,
+            "repeat": args.repeat,
+        },
+        "metrics": {},
+    }
+
+    try:
+        if args.mode in ("all", "pipeline"):
+            console.print(f"[cyan]파이프라인: {args.count}개 캐릭터[/cyan]")
+            results["metrics"].update(
+                bench_pipeline(work_dir, sd_url, args.count, args.seed, args.workers))
+        if args.mode in ("all", "isolated"):
+            console.print(f"[cyan]스테이지 단독: {args.repeat}회 반복[/cyan]")
+            results["metrics"].update(
+                bench_isolated(work_dir, sd_url, args.repeat, args.seed))
+    finally:
+        server.shutdown()
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_results(results)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    console.print(f"[blue]결과 저장: {output_path}[/blue]")
+
+    failed = failed_metrics(results)
+    if failed:
+        console.print(f"[red][FAIL] 스테이지 실패: {', '.join(failed)}[/red]")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for mismatch in meta_mismatches(results, baseline):
+            console.print(f"[yellow]기준과 실행 조건이 다릅니다 - {mismatch}[/yellow]")
+        rows = compare(results, baseline, args.threshold)
+        print_comparison(rows, args.threshold)
+        regressions = [row["metric"] for row in rows if row["regression"]]
+        if regressions:
+            console.print(f"[red][FAIL] 회귀: {', '.join(regressions)}[/red]")
+            sys.exit(1)
+        if not failed:
+            console.print("[green][OK] 회귀 없음[/green]")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
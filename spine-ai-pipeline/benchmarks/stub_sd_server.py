@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 Stable Diffusion WebUI 스텁 서버
+
+/sdapi/v1/txt2img 요청에 프롬프트로 결정되는 PNG를 돌려준다.
+같은 프롬프트·크기면 항상 같은 이미지가 나오므로 파이프라인 결과가 재현된다.
+
+사용법:
+    python stub_sd_server.py --port 7861 --latency 0.5
+    SD_API_URL=http://127.0.0.1:7861 python ../scripts/gen_illustration.py --prompt "test"
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import struct
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+from rich.console import Console
+
+console = Console()
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk) & 0xFFFFFFFF)
+
+
+@lru_cache(maxsize=64)
+def render_png(seed: bytes, width: int, height: int) -> bytes:
+    """시드로 결정되는 RGBA PNG 생성 (배경 + 캐릭터 실루엣 대신 색 띠)"""
+    bg = bytes((seed[0], seed[1], seed[2], 255))
+    fg = bytes((seed[3], seed[4], seed[5], 255))
+    band_left = width * (20 + seed[6] % 20) // 100
+    band_right = width - width * (20 + seed[7] % 20) // 100
+
+    rows = []
+    row_bg = b"\x00" + bg * width
+    row_fg = b"\x00" + bg * band_left + fg * (band_right - band_left) + bg * (width - band_right)
+    for y in range(height):
+        rows.append(row_fg if height // 10 <= y < height * 9 // 10 else row_bg)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(b"".join(rows), 6))
+            + _png_chunk(b"IEND", b""))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """txt2img 스텁 핸들러"""
+
+    # 서버 생성 시 설정
+    latency = 0.0
+    max_size: Optional[int] = None
+
+    def log_message(self, format, *args):  # noqa: A002 - 기본 시그니처 유지
+        pass
+
+    def do_POST(self):
+        if self.path != "/sdapi/v1/txt2img":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        width = int(payload.get("width", 512))
+        height = int(payload.get("height", 512))
+        if self.max_size:
+            width, height = min(width, self.max_size), min(height, self.max_size)
+
+        seed = hashlib.sha256(payload.get("prompt", "").encode("utf-8")).digest()
+        image = render_png(seed, width, height)
+
+        body = json.dumps({
+            "images": [base64.b64encode(image).decode("ascii")],
+            "parameters": payload,
+            "info": "",
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(port: int = 0, latency: float = 0.0,
+                 max_size: Optional[int] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드로 스텁 서버 시작, (서버, URL) 반환"""
+    handler = type("ConfiguredStubHandler", (StubHandler,),
+                   {"latency": latency, "max_size": max_size})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SD WebUI 스텁 서버")
+    parser.add_argument("--port", type=int, default=7861, help="포트")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--max-size", type=int, help="생성 이미지 최대 변 길이")
+    args = parser.parse_args()
+
+    server, url = start_server(args.port, args.latency, args.max_size)
+    console.print(f"[blue]스텁 SD 서버: {url} (지연 {args.latency}s)[/blue]")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
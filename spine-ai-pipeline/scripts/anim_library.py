@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+리그별 공유 애니메이션 라이브러리
+
+같은 리그·애니메이션 프리셋을 쓰는 캐릭터는 skeleton.json마다 똑같은 애니메이션 블록이 반복된다.
+정규화 해시가 같은 애니메이션을 리그(본 구성)별 라이브러리 파일 하나로 모으고,
+스켈레톤에는 참조만 남긴다. 독립 파일이 필요한 도구는 inflate로 되돌린다.
+
+스켈레톤 형식 (hoist 후):
+    "animations": {}
+    "animationLibrary": {"rig": <리그 키>, "path": <라이브러리 상대 경로>,
+                         "animations": {<이름>: <해시>, ...}}
+
+사용법:
+    python anim_library.py hoist ../mg-game-0001/spine/char_001/skeleton.json
+    python anim_library.py inflate char_001/skeleton.json --output standalone.json
+    python anim_library.py report ../mg-game-0001/spine
+    python anim_library.py gc ../mg-game-0001/spine --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+LIBRARY_DIR = "_animations"
+REFERENCE_KEY = "animationLibrary"
+
+
+def _canonical(data: Any) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def animation_hash(animation: Dict[str, Any]) -> str:
+    """애니메이션 정규화 해시 (키 순서/공백과 무관)"""
+    return hashlib.sha256(_canonical(animation)).hexdigest()[:16]
+
+
+def rig_key(skeleton: Dict[str, Any]) -> str:
+    """본 이름·부모 구성으로 리그 식별"""
+    bones = [(bone.get("name"), bone.get("parent")) for bone in skeleton.get("bones", [])]
+    return hashlib.sha256(_canonical(bones)).hexdigest()[:12]
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """라이브러리 갱신 잠금 (여러 export가 동시에 같은 리그를 쓸 때)"""
+    lock_path = path.with_name(f".{path.name}.lock")
+    with open(lock_path, "w") as lock_file:
+        if sys.platform != "win32":
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data: Dict[str, Any], indent: Optional[int] = 2) -> None:
+    """임시 파일 후 교체 (하드링크된 기존 파일을 건드리지 않음)"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def hoist_animations(skeleton_path: Path, library_dir: Path) -> Dict[str, Any]:
+    """스켈레톤의 애니메이션을 리그 라이브러리로 옮기고 참조만 남김
+
+    이미 참조 형식이면 아무것도 하지 않는다.
+    """
+    try:
+        skeleton = _load_json(skeleton_path)
+        animations = skeleton.get("animations", {})
+        if REFERENCE_KEY in skeleton or not animations:
+            return {"success": True, "hoisted": 0, "added": 0}
+
+        key = rig_key(skeleton)
+        library_dir.mkdir(parents=True, exist_ok=True)
+        library_path = library_dir / f"{key}.json"
+
+        refs = {name: animation_hash(anim) for name, anim in animations.items()}
+        added = 0
+        with _locked(library_path):
+            library = _load_json(library_path) if library_path.exists() else {
+                "rig": key,
+                "bones": [bone.get("name") for bone in skeleton.get("bones", [])],
+                "animations": {},
+            }
+            for name, anim in animations.items():
+                if refs[name] not in library["animations"]:
+                    library["animations"][refs[name]] = anim
+                    added += 1
+            if added:
+                _write_json(library_path, library, indent=None)
+
+            # 참조는 잠금 안에서 기록한다 (gc가 방금 추가한 항목을 지우지 않게)
+            skeleton["animations"] = {}
+            skeleton[REFERENCE_KEY] = {
+                "rig": key,
+                "path": Path(os.path.relpath(library_path, skeleton_path.parent)).as_posix(),
+                "animations": refs,
+            }
+            _write_json(skeleton_path, skeleton)
+
+        return {"success": True, "hoisted": len(refs), "added": added,
+                "library": str(library_path)}
+
+    except Exception as e:
+        console.print(f"[red]애니메이션 라이브러리 처리 실패: {e}[/red]")
+        return {"success": False, "error": str(e)}
+
+
+def inflate_skeleton(skeleton: Dict[str, Any], skeleton_dir: Path,
+                     library_cache: Optional[Dict[Path, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """참조 형식 스켈레톤을 애니메이션이 포함된 독립 스켈레톤으로 복원"""
+    reference = skeleton.get(REFERENCE_KEY)
+    if reference is None:
+        return skeleton
+
+    library_path = (skeleton_dir / reference["path"]).resolve()
+    if library_cache is not None and library_path in library_cache:
+        library = library_cache[library_path]
+    else:
+        library = _load_json(library_path)
+        if library_cache is not None:
+            library_cache[library_path] = library
+
+    inflated = {key: value for key, value in skeleton.items() if key != REFERENCE_KEY}
+    inflated["animations"] = {name: library["animations"][digest]
+                              for name, digest in reference["animations"].items()}
+    return inflated
+
+
+def load_skeleton(skeleton_path: Path,
+                  library_cache: Optional[Dict[Path, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """스켈레톤 로드 (참조 형식이면 복원해서 반환)"""
+    return inflate_skeleton(_load_json(skeleton_path), skeleton_path.parent, library_cache)
+
+
+def _skeleton_paths(spine_root: Path) -> List[Path]:
+    return sorted(p for p in spine_root.glob("*/skeleton.json")
+                  if not p.parent.name.startswith("."))
+
+
+def referenced_animations(spine_root: Path) -> Dict[Path, Set[str]]:
+    """라이브러리 파일별로 게임 스켈레톤이 참조하는 애니메이션 해시"""
+    refs: Dict[Path, Set[str]] = {}
+    for skeleton_path in _skeleton_paths(spine_root):
+        reference = _load_json(skeleton_path).get(REFERENCE_KEY)
+        if reference is None:
+            continue
+        library_path = (skeleton_path.parent / reference["path"]).resolve()
+        refs.setdefault(library_path, set()).update(reference["animations"].values())
+    return refs
+
+
+def collect_garbage(spine_root: Path, dry_run: bool = False) -> Dict[str, Any]:
+    """어느 스켈레톤도 참조하지 않는 애니메이션을 라이브러리에서 제거
+
+    프리셋 변경이나 재애니메이션으로 버려진 항목은 hoist가 지우지 않으므로 따로 정리한다.
+    참조가 하나도 없는 라이브러리 파일은 삭제한다.
+    라이브러리마다 잠금을 잡은 뒤 참조를 다시 읽으므로 동시에 도는 export와 충돌하지 않는다.
+    """
+    removed, deleted = 0, []
+    for library_path in sorted((spine_root / LIBRARY_DIR).glob("*.json")):
+        with _locked(library_path):
+            live = referenced_animations(spine_root).get(library_path.resolve(), set())
+            library = _load_json(library_path)
+            stale = [digest for digest in library.get("animations", {}) if digest not in live]
+            if not stale:
+                continue
+            removed += len(stale)
+            if dry_run:
+                continue
+            if not live:
+                library_path.unlink()
+                deleted.append(library_path.name)
+                continue
+            for digest in stale:
+                del library["animations"][digest]
+            _write_json(library_path, library, indent=None)
+    return {"removed": removed, "deleted": deleted}
+
+
+def report(spine_root: Path) -> Dict[str, Any]:
+    """게임 전체 기준 저장 용량 절감량과 파싱 시간 비교"""
+    skeleton_paths = _skeleton_paths(spine_root)
+    library_paths = sorted((spine_root / LIBRARY_DIR).glob("*.json"))
+
+    shared_bytes = sum(p.stat().st_size for p in skeleton_paths + library_paths)
+
+    # 참조되지 않는 항목 (gc 대상)
+    refs = referenced_animations(spine_root)
+    unreferenced = 0
+    for library_path in library_paths:
+        live = refs.get(library_path.resolve(), set())
+        unreferenced += sum(1 for digest in _load_json(library_path).get("animations", {})
+                            if digest not in live)
+
+    # 독립 형식으로 되돌린 크기 (export 기본 형식과 같은 indent=2)
+    cache: Dict[Path, Dict[str, Any]] = {}
+    inflated_texts = [json.dumps(load_skeleton(p, cache), indent=2, ensure_ascii=False)
+                      for p in skeleton_paths]
+    inflated_bytes = sum(len(text.encode("utf-8")) for text in inflated_texts)
+
+    started = time.perf_counter()
+    for text in inflated_texts:
+        json.loads(text)
+    inflated_parse = time.perf_counter() - started
+
+    shared_texts = [p.read_text(encoding="utf-8") for p in skeleton_paths + library_paths]
+    started = time.perf_counter()
+    for text in shared_texts:
+        json.loads(text)
+    shared_parse = time.perf_counter() - started
+
+    return {
+        "skeletons": len(skeleton_paths),
+        "libraries": len(library_paths),
+        "inflated_bytes": inflated_bytes,
+        "shared_bytes": shared_bytes,
+        "saved_bytes": inflated_bytes - shared_bytes,
+        "inflated_parse": inflated_parse,
+        "shared_parse": shared_parse,
+        "unreferenced": unreferenced,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 애니메이션 라이브러리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    hoist = sub.add_parser("hoist", help="스켈레톤 애니메이션을 라이브러리로 이동")
+    hoist.add_argument("skeletons", type=str, nargs="+", help="skeleton.json 경로")
+    hoist.add_argument("--library", type=str,
+                       help=f"라이브러리 폴더 (기본: 캐릭터 폴더 옆 {LIBRARY_DIR}/)")
+
+    inflate = sub.add_parser("inflate", help="독립 skeleton.json으로 복원")
+    inflate.add_argument("skeleton", type=str, help="skeleton.json 경로")
+    inflate.add_argument("--output", type=str, help="저장 경로 (기본: 제자리 덮어쓰기)")
+
+    rep = sub.add_parser("report", help="저장 용량 / 파싱 시간 비교")
+    rep.add_argument("root", type=str, help="게임 레포 spine 폴더")
+
+    gc = sub.add_parser("gc", help="참조되지 않는 애니메이션 제거")
+    gc.add_argument("root", type=str, help="게임 레포 spine 폴더")
+    gc.add_argument("--dry-run", action="store_true", help="제거 대상 수만 출력")
+
+    args = parser.parse_args()
+
+    if args.command == "hoist":
+        total: List[int] = [0, 0]
+        for path_str in args.skeletons:
+            skeleton_path = Path(path_str)
+            library_dir = Path(args.library) if args.library else \
+                skeleton_path.parent.parent / LIBRARY_DIR
+            result = hoist_animations(skeleton_path, library_dir)
+            if result.get("success"):
+                total[0] += result["hoisted"]
+                total[1] += result["added"]
+        console.print(f"[green][OK] Hoisted: {total[0]} animations, "
+                      f"{total[1]} new in library[/green]")
+
+    elif args.command == "inflate":
+        skeleton_path = Path(args.skeleton)
+        skeleton = load_skeleton(skeleton_path)
+        output = Path(args.output) if args.output else skeleton_path
+        _write_json(output, skeleton)
+        console.print(f"[green][OK] Inflated: {output} "
+                      f"({len(skeleton.get('animations', {}))} animations)[/green]")
+
+    elif args.command == "report":
+        result = report(Path(args.root))
+        table = Table(title=f"공유 애니메이션 ({result['skeletons']}개 스켈레톤, "
+                            f"{result['libraries']}개 라이브러리)")
+        table.add_column("형식")
+        table.add_column("크기(KB)", justify="right")
+        table.add_column("파싱(ms)", justify="right")
+        table.add_row("독립", f"{result['inflated_bytes'] / 1024:.1f}",
+                      f"{result['inflated_parse'] * 1000:.1f}")
+        table.add_row("공유", f"{result['shared_bytes'] / 1024:.1f}",
+                      f"{result['shared_parse'] * 1000:.1f}")
+        console.print(table)
+        console.print(f"[blue]절감: {result['saved_bytes'] / 1024:.1f} KB[/blue]")
+        if result["unreferenced"]:
+            console.print(f"[yellow]참조되지 않는 애니메이션 {result['unreferenced']}개 "
+                          f"(gc로 정리)[/yellow]")
+
+    elif args.command == "gc":
+        result = collect_garbage(Path(args.root), args.dry_run)
+        if args.dry_run:
+            console.print(f"[blue]제거 대상: {result['removed']} animations[/blue]")
+        else:
+            console.print(f"[green][OK] Removed: {result['removed']} animations, "
+                          f"{len(result['deleted'])} libraries deleted[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -112,13 +112,17 @@ ANIMATION_GENERATORS = {
 }
 
 
-def add_animations_to_spine(spine_path: Path, animations: List[str]) -> Dict[str, Any]:
-    """Spine 프로젝트에 애니메이션 추가"""
+def add_animations_to_spine(spine_path: Path, animations: List[str],
+                            replace: bool = False) -> Dict[str, Any]:
+    """Spine 프로젝트에 애니메이션 추가
+
+    replace: 기존 애니메이션을 비우고 다시 생성 (프리셋이 바뀌어 재실행할 때)
+    """
     try:
         with open(spine_path, "r", encoding="utf-8") as f:
             spine_data = json.load(f)
 
-        if "animations" not in spine_data:
+        if replace or "animations" not in spine_data:
             spine_data["animations"] = {}
 
         added = []
@@ -155,7 +159,7 @@ def main():
 
     if not spine_json.exists():
         console.print(f"[red]Spine 프로젝트를 찾을 수 없습니다: {spine_json}[/red]")
-        return
+        raise SystemExit(1)
 
     config_dir = Path(__file__).parent.parent / "config"
 
@@ -174,6 +178,7 @@ def main():
         console.print(f"[green]  Added: {', '.join(result.get('added', []))}[/green]")
     else:
         console.print("[red][FAIL] Animation failed[/red]")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+게임 레포 단위 Spine 에셋 인덱스
+
+캐릭터별 manifest.json을 하나의 SQLite 파일(spine/index.sqlite)로 모아
+매니페스트를 일일이 열지 않고 캐릭터/파일/애니메이션을 조회한다.
+export_spine.py가 출력할 때마다 해당 캐릭터 행만 갱신한다.
+
+사용법:
+    python asset_index.py --game mg-game-0001 --stats
+    python asset_index.py --game mg-game-0001 --animation die
+    python asset_index.py --root ../mg-game-0001/spine --rebuild
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+INDEX_NAME = "index.sqlite"
+MANIFEST_NAME = "manifest.json"
+
+# 텍스처로 집계할 확장자
+TEXTURE_SUFFIXES = (".png", ".webp", ".jpg", ".jpeg")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    character_id TEXT PRIMARY KEY,
+    manifest_sha256 TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    total_bytes INTEGER NOT NULL,
+    texture_bytes INTEGER NOT NULL,
+    bone_count INTEGER NOT NULL,
+    slot_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    character_id TEXT NOT NULL REFERENCES characters(character_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT,
+    PRIMARY KEY (character_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS animations (
+    character_id TEXT NOT NULL REFERENCES characters(character_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    PRIMARY KEY (character_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS animations_name ON animations (name);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256);
+"""
+
+
+def manifest_digest(manifest: Dict[str, Any]) -> str:
+    """매니페스트 내용 해시 (변경 여부 판단용)"""
+    canonical = json.dumps(manifest, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AssetIndex:
+    """게임 레포 spine 폴더의 SQLite 인덱스"""
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.index_path), timeout=30.0)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def update_character(self, manifest: Dict[str, Any]) -> bool:
+        """매니페스트로 캐릭터 행 갱신 (내용이 같으면 건너뛰고 False)"""
+        char_id = manifest["character_id"]
+        digest = manifest_digest(manifest)
+        row = self.conn.execute(
+            "SELECT manifest_sha256 FROM characters WHERE character_id = ?", (char_id,)
+        ).fetchone()
+        if row and row["manifest_sha256"] == digest:
+            return False
+
+        files = manifest.get("files", [])
+        total_bytes = sum(entry.get("size", 0) for entry in files)
+        texture_bytes = sum(entry.get("size", 0) for entry in files
+                            if entry["name"].lower().endswith(TEXTURE_SUFFIXES))
+
+        with self.conn:
+            self.conn.execute("DELETE FROM characters WHERE character_id = ?", (char_id,))
+            self.conn.execute(
+                "INSERT INTO characters VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (char_id, digest, len(files), total_bytes, texture_bytes,
+                 manifest.get("bones", 0), manifest.get("slots", 0), time.time()),
+            )
+            self.conn.executemany(
+                "INSERT INTO files VALUES (?, ?, ?, ?)",
+                [(char_id, entry["name"], entry.get("size", 0), entry.get("sha256"))
+                 for entry in files],
+            )
+            self.conn.executemany(
+                "INSERT INTO animations VALUES (?, ?)",
+                [(char_id, name) for name in manifest.get("animations", [])],
+            )
+        return True
+
+    def remove_character(self, character_id: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM characters WHERE character_id = ?", (character_id,))
+
+    def rebuild(self, spine_root: Path) -> Dict[str, int]:
+        """spine 폴더의 매니페스트를 스캔해 변경분만 반영"""
+        seen = set()
+        updated = 0
+        for manifest_path in sorted(spine_root.glob(f"*/{MANIFEST_NAME}")):
+            if manifest_path.parent.name.startswith("."):
+                continue  # export_spine 스테이징 폴더
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            manifest.setdefault("character_id", manifest_path.parent.name)
+            seen.add(manifest["character_id"])
+            if self.update_character(manifest):
+                updated += 1
+
+        stale = [cid for cid in self.character_ids() if cid not in seen]
+        for char_id in stale:
+            self.remove_character(char_id)
+        return {"scanned": len(seen), "updated": updated, "removed": len(stale)}
+
+    def character_ids(self) -> List[str]:
+        rows = self.conn.execute("SELECT character_id FROM characters ORDER BY character_id")
+        return [row[0] for row in rows]
+
+    def characters_with_animation(self, animation: str) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT character_id FROM animations WHERE name = ? ORDER BY character_id",
+            (animation,),
+        )
+        return [row[0] for row in rows]
+
+    def character(self, character_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT * FROM characters WHERE character_id = ?", (character_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        info = dict(row)
+        info["files"] = [dict(r) for r in self.conn.execute(
+            "SELECT name, size, sha256 FROM files WHERE character_id = ? ORDER BY name",
+            (character_id,))]
+        info["animations"] = [r[0] for r in self.conn.execute(
+            "SELECT name FROM animations WHERE character_id = ? ORDER BY name",
+            (character_id,))]
+        return info
+
+    def stats(self) -> Dict[str, Any]:
+        """게임 전체 집계"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS characters, COALESCE(SUM(file_count), 0) AS files, "
+            "COALESCE(SUM(total_bytes), 0) AS total_bytes, "
+            "COALESCE(SUM(texture_bytes), 0) AS texture_bytes FROM characters"
+        ).fetchone()
+        stats = dict(row)
+        unique = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM "
+            "(SELECT sha256, MAX(size) AS size FROM files WHERE sha256 IS NOT NULL GROUP BY sha256)"
+        ).fetchone()
+        stats["unique_blobs"], stats["unique_bytes"] = unique[0], unique[1]
+        stats["animations"] = {r[0]: r[1] for r in self.conn.execute(
+            "SELECT name, COUNT(*) FROM animations GROUP BY name ORDER BY name")}
+        return stats
+
+
+def default_spine_root(game: str) -> Path:
+    """게임 레포의 spine 폴더 (export_spine.py와 같은 위치 규칙)"""
+    repos_dir = Path(__file__).parent.parent.parent.parent
+    return repos_dir / game / "spine"
+
+
+def _format_bytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MB" if size >= 1024 * 1024 else f"{size / 1024:.1f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spine 에셋 인덱스 조회")
+    parser.add_argument("--game", type=str, help="대상 게임 레포 (예: mg-game-0001)")
+    parser.add_argument("--root", type=str, help="spine 폴더 경로 직접 지정")
+    parser.add_argument("--rebuild", action="store_true", help="매니페스트 스캔 후 인덱스 갱신")
+    parser.add_argument("--stats", action="store_true", help="전체 집계 출력")
+    parser.add_argument("--animation", type=str, help="해당 애니메이션을 가진 캐릭터 조회")
+    parser.add_argument("--character", type=str, help="캐릭터 상세 조회")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.root:
+        spine_root = Path(args.root)
+    elif args.game:
+        spine_root = default_spine_root(args.game)
+    else:
+        console.print("[red]--game 또는 --root 중 하나를 지정하세요[/red]")
+        return
+
+    if not spine_root.exists():
+        console.print(f"[red]폴더를 찾을 수 없습니다: {spine_root}[/red]")
+        return
+
+    index = AssetIndex(spine_root / INDEX_NAME)
+    result: Any = None
+    missing = False
+
+    if args.rebuild:
+        summary = index.rebuild(spine_root)
+        console.print(f"[green][OK] Index rebuilt: {summary['scanned']} scanned, "
+                      f"{summary['updated']} updated, {summary['removed']} removed[/green]")
+
+    if args.animation:
+        result = index.characters_with_animation(args.animation)
+        if not args.json:
+            console.print(f"[blue]'{args.animation}' 애니메이션: {len(result)}개 캐릭터[/blue]")
+            for char_id in result:
+                console.print(f"  {char_id}")
+
+    if args.character:
+        result = index.character(args.character)
+        if result is None:
+            missing = True
+            console.print(f"[red]인덱스에 없는 캐릭터: {args.character}[/red]")
+        elif not args.json:
+            console.print(f"[blue]{args.character}: 본 {result['bone_count']}, "
+                          f"슬롯 {result['slot_count']}, {_format_bytes(result['total_bytes'])}[/blue]")
+            console.print(f"  애니메이션: {', '.join(result['animations'])}")
+            for entry in result["files"]:
+                console.print(f"  {entry['name']} ({_format_bytes(entry['size'])})")
+
+    # 조회 없이 실행하면 전체 집계
+    if args.stats or not (args.animation or args.character or args.rebuild):
+        result = index.stats()
+        if not args.json:
+            table = Table(title=str(spine_root))
+            table.add_column("항목")
+            table.add_column("값", justify="right")
+            table.add_row("캐릭터", str(result["characters"]))
+            table.add_row("파일", str(result["files"]))
+            table.add_row("전체 크기", _format_bytes(result["total_bytes"]))
+            table.add_row("텍스처 크기", _format_bytes(result["texture_bytes"]))
+            table.add_row("고유 파일 크기", _format_bytes(result["unique_bytes"]))
+            for name, count in result["animations"].items():
+                table.add_row(f"애니메이션 {name}", str(count))
+            console.print(table)
+
+    if args.json and result is not None:
+        console.print_json(json.dumps(result, ensure_ascii=False))
+
+    index.close()
+    if missing:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,150 +5,478 @@
 사용법:
     python batch_generate.py --input characters.csv --output output/
     python batch_generate.py --input characters.json --game mg-game-0001
+    python batch_generate.py --input characters.jsonl --shard 0/4 --summary shard0.json
+    python batch_generate.py --input characters.jsonl --queue queue.db --workers 4
+    python batch_generate.py --queue queue.db --worker-only --workers 4
+    python batch_generate.py --input characters.csv --telemetry run.jsonl --profile 5
+    python batch_generate.py --input characters.jsonl --watch
 """
 
 import argparse
-import csv
 import json
-import subprocess
+import multiprocessing
+import os
+import shutil
+import socket
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from rich.console import Console
 from rich.progress import Progress, TaskID
 
+from roster import (iter_characters, iter_characters_csv, iter_characters_json,
+                    iter_shard, parse_shard)
+from telemetry import (RUN_ID_ENV, TELEMETRY_ENV, TelemetryWriter, character_totals,
+                       load_records, new_run_id, print_summary, profile_command,
+                       run_measured, summarize, write_prometheus)
+from work_queue import WorkQueue
+
 console = Console()
 
 
 def load_characters_csv(csv_path: Path) -> List[Dict[str, Any]]:
     """CSV에서 캐릭터 목록 로드"""
-    characters = []
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            characters.append(row)
-    return characters
+    return list(iter_characters_csv(csv_path))
 
 
 def load_characters_json(json_path: Path) -> List[Dict[str, Any]]:
     """JSON에서 캐릭터 목록 로드"""
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        if isinstance(data, list):
-            return data
-        return data.get("characters", [])
+    return list(iter_characters_json(json_path))
+
+
+# 하위 스크립트 제한 시간(초)
+SCRIPT_TIMEOUT = 300
+
+# 텔레메트리에 남길 실행 지표
+METRIC_KEYS = ("wall_time", "cpu_time", "cpu_user", "cpu_system", "max_rss_bytes",
+               "bytes_read", "bytes_written", "returncode", "sd_latency", "sd_retries")
 
+# --profile 사용 시 프로파일 출력 루트 (워커 프로세스에도 전달되도록 환경 변수 사용)
+PROFILE_DIR_ENV = "SPINE_PROFILE_DIR"
 
-def run_script(script_name: str, args: List[str]) -> bool:
-    """스크립트 실행"""
+
+def run_script(script_name: str, args: List[str],
+               char_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """스크립트 실행
+
+    char_dir를 지정하면 stdout/stderr를 char_dir/logs/<스크립트>.log 에 남긴다.
+    반환값에는 성공 여부와 자원 사용량 지표가 포함된다.
+    """
     script_path = Path(__file__).parent / script_name
+    cmd = [sys.executable, str(script_path)] + args
+
+    profile_root = os.environ.get(PROFILE_DIR_ENV)
+    if profile_root and char_dir is not None:
+        prefix = Path(profile_root) / char_dir.name / script_path.stem
+        cmd = profile_command(prefix, script_path, args)
+
+    env = dict(os.environ, **{TELEMETRY_ENV: "1"})
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)] + args,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        return result.returncode == 0
-    except subprocess.TimeoutExpired:
-        console.print(f"[red]타임아웃: {script_name}[/red]")
-        return False
+        result = run_measured(cmd, timeout=SCRIPT_TIMEOUT, env=env)
     except Exception as e:
         console.print(f"[red]실행 오류: {e}[/red]")
-        return False
+        return {"success": False, "error": str(e)}
 
+    if result["timed_out"]:
+        console.print(f"[red]타임아웃: {script_name}[/red]")
 
-def process_character(character: Dict[str, Any], output_dir: Path,
-                      progress: Progress, task: TaskID) -> bool:
-    """단일 캐릭터 처리"""
-    char_id = character.get("character_id", "unknown")
-    char_dir = output_dir / char_id
+    if char_dir is not None:
+        log_dir = char_dir / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        with open(log_dir / f"{script_path.stem}.log", "w", encoding="utf-8") as f:
+            f.write(result["stdout"])
+            if result["stderr"]:
+                f.write("\n--- stderr ---\n")
+                f.write(result["stderr"])
 
-    console.print(f"\n[cyan]처리 중: {char_id}[/cyan]")
+    run = {key: result[key] for key in METRIC_KEYS if key in result}
+    run["success"] = result["returncode"] == 0 and not result["timed_out"]
+    if not run["success"]:
+        # 스크립트는 실패 사유를 콘솔(stdout)에 출력하고 종료 코드 1로 끝난다
+        run["error"] = (result["stderr"] or result["stdout"])[-2000:]
+    return run
 
-    # 1. 설정 파일 생성
+
+# 스테이지 결과
+STAGE_OK = "ok"
+STAGE_FAILED = "failed"
+STAGE_SKIPPED = "skipped"    # 입력 파일이 없어 실행하지 않음
+
+
+def write_config(character: Dict[str, Any], output_dir: Path) -> Path:
+    """캐릭터 설정 파일 생성"""
+    char_dir = output_dir / character.get("character_id", "unknown")
     config_path = char_dir / "config.json"
     char_dir.mkdir(parents=True, exist_ok=True)
     with open(config_path, "w", encoding="utf-8") as f:
         json.dump(character, f, indent=2, ensure_ascii=False)
+    return config_path
+
+
+def _stage_result(run: Dict[str, Any]) -> Dict[str, Any]:
+    """run_script 결과를 스테이지 결과로 변환"""
+    result = dict(run)
+    result["status"] = STAGE_OK if result.pop("success") else STAGE_FAILED
+    return result
+
+
+def stage_illustration(character: Dict[str, Any], output_dir: Path) -> Dict[str, Any]:
+    """일러스트 생성 스테이지"""
+    config_path = write_config(character, output_dir)
+    result = _stage_result(run_script("gen_illustration.py",
+                                      ["--config", str(config_path),
+                                       "--output", str(output_dir)],
+                                      config_path.parent))
+    if result["status"] == STAGE_FAILED:
+        console.print(f"[yellow]  일러스트 생성 실패 (SD API 확인 필요)[/yellow]")
+    return result
 
-    # 2. 일러스트 생성
-    progress.update(task, description=f"[{char_id}] 일러스트 생성...")
-    if not run_script("gen_illustration.py", ["--config", str(config_path),
-                                               "--output", str(output_dir)]):
-        console.print(f"[yellow]  일러스트 생성 스킵 (SD API 필요)[/yellow]")
 
-    # 3. 파츠 분리
-    progress.update(task, description=f"[{char_id}] 파츠 분리...")
+def stage_split(character: Dict[str, Any], output_dir: Path) -> Dict[str, Any]:
+    """파츠 분리 스테이지"""
+    char_dir = output_dir / character.get("character_id", "unknown")
     illustration_path = char_dir / "illustration.png"
-    if illustration_path.exists():
-        run_script("split_parts.py", ["--input", str(illustration_path),
-                                       "--output", str(char_dir / "parts")])
+    if not illustration_path.exists():
+        return {"status": STAGE_SKIPPED}
+    return _stage_result(run_script("split_parts.py",
+                                    ["--input", str(illustration_path),
+                                     "--output", str(char_dir / "parts")],
+                                    char_dir))
 
-    # 4. 리깅 생성
-    progress.update(task, description=f"[{char_id}] 리깅 생성...")
-    parts_dir = char_dir / "parts"
-    if parts_dir.exists():
-        run_script("rig_character.py", ["--input", str(parts_dir),
-                                         "--output", str(char_dir / "spine")])
 
-    # 5. 애니메이션 추가
-    progress.update(task, description=f"[{char_id}] 애니메이션...")
+def stage_rig(character: Dict[str, Any], output_dir: Path) -> Dict[str, Any]:
+    """리깅 생성 스테이지"""
+    char_dir = output_dir / character.get("character_id", "unknown")
+    parts_dir = char_dir / "parts"
+    if not parts_dir.exists():
+        return {"status": STAGE_SKIPPED}
+    return _stage_result(run_script("rig_character.py",
+                                    ["--input", str(parts_dir),
+                                     "--output", str(char_dir / "spine"),
+                                     "--preset", character.get("rig_type", "humanoid")],
+                                    char_dir))
+
+
+def stage_animate(character: Dict[str, Any], output_dir: Path) -> Dict[str, Any]:
+    """애니메이션 추가 스테이지"""
+    char_dir = output_dir / character.get("character_id", "unknown")
     spine_dir = char_dir / "spine"
-    if spine_dir.exists():
-        preset = character.get("animation_preset", "combat")
-        run_script("animate_character.py", ["--input", str(spine_dir),
-                                             "--preset", preset])
+    if not spine_dir.exists():
+        return {"status": STAGE_SKIPPED}
+    preset = character.get("animation_preset", "combat")
+    return _stage_result(run_script("animate_character.py",
+                                    ["--input", str(spine_dir), "--preset", preset],
+                                    char_dir))
+
+
+# (이름, 진행 표시, 실행 함수) - 순서대로 실행된다
+STAGES = [
+    ("illustration", "일러스트 생성", stage_illustration),
+    ("split", "파츠 분리", stage_split),
+    ("rig", "리깅 생성", stage_rig),
+    ("animate", "애니메이션", stage_animate),
+]
+
+STAGE_FUNCS = {name: func for name, _, func in STAGES}
+
+
+def process_character(character: Dict[str, Any], output_dir: Path,
+                      progress: Progress, task: TaskID,
+                      telemetry: Optional[TelemetryWriter] = None) -> bool:
+    """단일 캐릭터 처리 (실패한 스테이지가 있으면 False)"""
+    char_id = character.get("character_id", "unknown")
+
+    console.print(f"\n[cyan]처리 중: {char_id}[/cyan]")
+
+    success = True
+    for stage, label, stage_func in STAGES:
+        progress.update(task, description=f"[{char_id}] {label}...")
+        result = stage_func(character, output_dir)
+        if result["status"] == STAGE_FAILED:
+            success = False
+        if telemetry:
+            telemetry.write({"character_id": char_id, "stage": stage, **result})
 
     progress.advance(task)
-    return True
+    return success
+
+
+def run_worker(queue_path: Path, output_dir: Path, worker_id: str,
+               lease_seconds: float, poll_interval: float,
+               telemetry_path: Optional[Path] = None,
+               journal_mode: Optional[str] = None) -> int:
+    """큐에서 작업을 가져와 처리하는 워커 루프 (처리한 작업 수 반환)"""
+    queue = WorkQueue(queue_path, lease_seconds=lease_seconds, journal_mode=journal_mode)
+    telemetry = TelemetryWriter(telemetry_path) if telemetry_path else None
+    processed = 0
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                if queue.is_drained():
+                    return processed
+                time.sleep(poll_interval)
+                continue
+
+            char_id = job["character_id"]
+            console.print(f"[cyan]{worker_id}: {char_id} / {job['stage']} "
+                          f"(시도 {job['attempts']}/{job['max_attempts']})[/cyan]")
+
+            with queue.heartbeat(job["id"], worker_id):
+                try:
+                    result = STAGE_FUNCS[job["stage"]](job["character"], output_dir)
+                except Exception as e:
+                    result = {"status": STAGE_FAILED, "error": str(e)}
+
+            status = result["status"]
+            error = result.get("error", "stage failed") if status == STAGE_FAILED else None
+            queue.complete(job["id"], worker_id, status, error)
+            if telemetry:
+                telemetry.write({"character_id": char_id, "stage": job["stage"],
+                                 "attempt": job["attempts"], "worker": worker_id, **result})
+            processed += 1
+    finally:
+        queue.close()
+
+
+def _worker_entry(queue_path: Path, output_dir: Path, worker_id: str,
+                  lease_seconds: float, poll_interval: float,
+                  telemetry_path: Optional[Path], journal_mode: Optional[str]) -> None:
+    """워커 프로세스 진입점"""
+    run_worker(queue_path, output_dir, worker_id, lease_seconds, poll_interval,
+               telemetry_path, journal_mode)
+
+
+def run_queue(queue_path: Path, output_dir: Path, workers: int,
+              lease_seconds: float, poll_interval: float,
+              telemetry_path: Optional[Path] = None,
+              journal_mode: Optional[str] = None) -> None:
+    """로컬 워커 프로세스 실행 후 대기"""
+    host = socket.gethostname()
+    processes = []
+    for i in range(workers):
+        worker_id = f"{host}:{os.getpid()}:{i}"
+        process = multiprocessing.Process(
+            target=_worker_entry,
+            args=(queue_path, output_dir, worker_id, lease_seconds, poll_interval,
+                  telemetry_path, journal_mode),
+        )
+        process.start()
+        processes.append(process)
+
+    for process in processes:
+        process.join()
+
+
+def report_telemetry(telemetry_path: Path, prometheus: Optional[str],
+                     profile_top: int, profile_dir: Path,
+                     run_id: Optional[str] = None) -> None:
+    """성능 요약 출력, Prometheus 저장, 느린 캐릭터 외 프로파일 정리
+
+    run_id를 주면 기록 파일에 쌓인 이전 실행은 빼고 이번 실행만 집계한다.
+    """
+    records = load_records(telemetry_path, run_id)
+    summary = summarize(records)
+    print_summary(summary)
+    console.print(f"[blue]성능 기록: {telemetry_path}[/blue]")
+
+    if prometheus:
+        write_prometheus(summary, Path(prometheus))
+        console.print(f"[blue]Prometheus 저장: {prometheus}[/blue]")
+
+    if profile_top > 0 and profile_dir.exists():
+        totals = character_totals(records)
+        slowest = sorted(totals, key=totals.get, reverse=True)[:profile_top]
+        for char_profile in profile_dir.iterdir():
+            if char_profile.is_dir() and char_profile.name not in slowest:
+                shutil.rmtree(char_profile)
+        console.print(f"[blue]프로파일 보관 ({profile_dir}): {', '.join(slowest)}[/blue]")
+
+
+def write_summary(summary_path: Path, summary: Dict[str, Any]) -> None:
+    """결과 요약 저장"""
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    console.print(f"[blue]요약 저장: {summary_path}[/blue]")
 
 
 def main():
     parser = argparse.ArgumentParser(description="캐릭터 일괄 생성")
-    parser.add_argument("--input", type=str, required=True,
-                        help="캐릭터 목록 파일 (CSV 또는 JSON)")
+    parser.add_argument("--input", type=str,
+                        help="캐릭터 목록 파일 (CSV, JSON 또는 JSON Lines)")
     parser.add_argument("--output", type=str, default="output",
                         help="출력 경로")
     parser.add_argument("--game", type=str,
                         help="대상 게임 레포")
     parser.add_argument("--skip-existing", action="store_true",
                         help="이미 존재하는 캐릭터 스킵")
+    parser.add_argument("--shard", type=str,
+                        help="처리할 샤드 (i/N, 예: 0/4)")
+    parser.add_argument("--summary", type=str,
+                        help="결과 요약 JSON 저장 경로 (merge_summaries.py로 병합)")
+    parser.add_argument("--queue", type=str,
+                        help="SQLite 작업 큐 경로 (지정 시 큐 기반으로 처리)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="큐 모드에서 이 노드가 실행할 워커 프로세스 수 (0이면 적재만)")
+    parser.add_argument("--worker-only", action="store_true",
+                        help="로스터 적재 없이 기존 큐의 작업만 처리")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="스테이지별 최대 시도 횟수")
+    parser.add_argument("--lease", type=float, default=60.0,
+                        help="작업 임대 시간(초), 하트비트로 연장됨")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="대기 중인 작업이 없을 때 재확인 간격(초)")
+    parser.add_argument("--queue-journal", type=str,
+                        choices=["wal", "delete"],
+                        help="큐 저널 모드 (여러 호스트가 공유 파일시스템을 쓰면 delete, "
+                             "기본: 새 큐는 wal, 기존 큐는 저장된 모드 유지)")
+    parser.add_argument("--telemetry", type=str,
+                        help="캐릭터/스테이지별 성능 기록 JSON Lines 경로 (기존 파일에 추가)")
+    parser.add_argument("--prometheus", type=str,
+                        help="성능 요약 Prometheus textfile 저장 경로")
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="가장 느린 N개 캐릭터의 cProfile/tracemalloc 스냅샷 보관")
+    parser.add_argument("--watch", action="store_true",
+                        help="상주 감시 모드 (변경된 캐릭터/프리셋의 영향 스테이지만 재실행)")
     args = parser.parse_args()
 
-    input_path = Path(args.input)
     output_dir = Path(args.output)
 
-    if not input_path.exists():
-        console.print(f"[red]파일을 찾을 수 없습니다: {input_path}[/red]")
-        return
-
-    # 캐릭터 목록 로드
-    if input_path.suffix == ".csv":
-        characters = load_characters_csv(input_path)
+    telemetry_path = Path(args.telemetry) if args.telemetry else None
+    profile_dir = output_dir / "_profile"
+    if args.profile > 0:
+        # 모든 스크립트를 프로파일러 아래에서 실행하고, 끝난 뒤 느린 N개만 남긴다
+        os.environ[PROFILE_DIR_ENV] = str(profile_dir)
+        if telemetry_path is None:
+            telemetry_path = profile_dir / "telemetry.jsonl"
+    if args.prometheus and telemetry_path is None:
+        telemetry_path = output_dir / "telemetry.jsonl"
+    # 기록 파일에는 이전 실행도 쌓이므로 이번 실행 ID를 남겨 요약 때 구분한다
+    run_id = os.environ.setdefault(RUN_ID_ENV, new_run_id())
+    telemetry = TelemetryWriter(telemetry_path) if telemetry_path else None
+
+    if args.worker_only:
+        if not args.queue:
+            console.print("[red]--worker-only 는 --queue 와 함께 사용해야 합니다[/red]")
+            return
+        input_path = None
     else:
-        characters = load_characters_json(input_path)
-
-    console.print(f"[blue]총 {len(characters)}개 캐릭터 처리 예정[/blue]")
-
-    # 일괄 처리
-    success_count = 0
-    with Progress() as progress:
-        task = progress.add_task("[green]처리 중...", total=len(characters))
+        if not args.input:
+            console.print("[red]--input 을 지정하세요[/red]")
+            return
+        input_path = Path(args.input)
+        if not input_path.exists():
+            console.print(f"[red]파일을 찾을 수 없습니다: {input_path}[/red]")
+            return
+
+    if args.watch:
+        if input_path is None:
+            console.print("[red]--watch 는 --input 과 함께 사용해야 합니다[/red]")
+            return
+        from watch import run_watch
+        run_watch(input_path, output_dir, workers=max(args.workers, 1),
+                  poll_interval=args.poll_interval, initial=True,
+                  telemetry_path=telemetry_path)
+        return
 
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        console.print(f"[blue]샤드: {shard[0]}/{shard[1]}[/blue]")
+
+    characters = iter([])
+    if input_path:
+        # 캐릭터 목록은 스트리밍으로 읽는다 (전체 개수는 미리 알 수 없음)
+        characters = iter_characters(input_path)
+        if shard:
+            characters = iter_shard(characters, *shard)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    started_at = time.time()
+
+    if args.queue:
+        queue_path = Path(args.queue)
+        queue = WorkQueue(queue_path, lease_seconds=args.lease,
+                          journal_mode=args.queue_journal)
+        stages = [(name, args.max_attempts) for name, _, _ in STAGES]
+
+        enqueued = 0
         for character in characters:
             char_id = character.get("character_id", "unknown")
-
             if args.skip_existing and (output_dir / char_id / "spine").exists():
                 console.print(f"[yellow]스킵: {char_id} (이미 존재)[/yellow]")
-                progress.advance(task)
+                results[char_id] = {"status": "skipped"}
+                if telemetry:
+                    telemetry.write({"character_id": char_id, "stage": "all",
+                                     "status": STAGE_SKIPPED, "cache_hit": True})
                 continue
-
-            if process_character(character, output_dir, progress, task):
-                success_count += 1
-
-    console.print(f"\n[green]완료: {success_count}/{len(characters)}개 성공[/green]")
+            if queue.enqueue(character, stages):
+                enqueued += 1
+        if input_path:
+            console.print(f"[blue]큐 적재: {enqueued}개 캐릭터 → {queue_path}[/blue]")
+
+        if args.workers > 0:
+            console.print(f"[blue]워커 {args.workers}개 실행[/blue]")
+            run_queue(queue_path, output_dir, args.workers,
+                      args.lease, args.poll_interval, telemetry_path, args.queue_journal)
+
+        counts = queue.counts()
+        console.print("[blue]큐 상태: " + ", ".join(
+            f"{status} {n}" for status, n in sorted(counts.items())) + "[/blue]")
+        results.update(queue.character_results())
+        queue.close()
+
+        success_count = sum(1 for r in results.values() if r["status"] == "success")
+    else:
+        # 일괄 처리
+        success_count = 0
+        with Progress() as progress:
+            task = progress.add_task("[green]처리 중...", total=None)
+
+            for character in characters:
+                char_id = character.get("character_id", "unknown")
+
+                if args.skip_existing and (output_dir / char_id / "spine").exists():
+                    console.print(f"[yellow]스킵: {char_id} (이미 존재)[/yellow]")
+                    results[char_id] = {"status": "skipped"}
+                    if telemetry:
+                        telemetry.write({"character_id": char_id, "stage": "all",
+                                         "status": STAGE_SKIPPED, "cache_hit": True})
+                    progress.advance(task)
+                    continue
+
+                if process_character(character, output_dir, progress, task, telemetry):
+                    success_count += 1
+                    results[char_id] = {"status": "success"}
+                else:
+                    results[char_id] = {"status": "failed"}
+
+    processed = sum(1 for r in results.values() if r["status"] != "skipped")
+    console.print(f"\n[green]완료: {success_count}/{processed}개 성공[/green]")
+
+    if args.summary:
+        summary = {
+            "input": str(input_path) if input_path else None,
+            "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+            "started_at": started_at,
+            "finished_at": time.time(),
+            "total": len(results),
+            "success": success_count,
+            "failed": sum(1 for r in results.values() if r["status"] == "failed"),
+            "skipped": len(results) - processed,
+            "characters": results,
+        }
+        write_summary(Path(args.summary), summary)
+
+    if telemetry_path:
+        report_telemetry(telemetry_path, args.prometheus, args.profile, profile_dir, run_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+캐릭터 간 파츠 중복 제거 스크립트
+
+같은 스타일 프리셋으로 만든 캐릭터들은 무기/신발/갑옷 파츠가 거의 같은 경우가 많다.
+로스터 출력 폴더의 모든 parts/를 모아 정확한 해시(SHA-256)와 지각 해시(dHash)로
+중복 후보를 찾고, 색/알파 썸네일 차이로 한 번 더 확인해 묶는다 (dHash는 회색조 모양만 본다).
+대표 이미지를 공유 파츠 라이브러리로 옮긴 뒤
+metadata.json과 skeleton.json 어태치먼트가 라이브러리를 참조하도록 고친다.
+
+skeleton.json의 어태치먼트 path는 Spine 규칙대로 스켈레톤의 images 폴더(캐릭터 parts/) 기준이다.
+아틀라스 패킹 시 parts/와 함께 output/_shared_parts/가 입력으로 들어가야 한다.
+
+사용법:
+    python dedup_parts.py --input output/ --dry-run
+    python dedup_parts.py --input output/ --threshold 4 --prune
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+LIBRARY_DIR = "_shared_parts"
+
+# dHash 크기 (HASH_SIZE × HASH_SIZE 비트)
+HASH_SIZE = 8
+
+# 한 번에 비교할 행 수 (N × CHUNK × 8 바이트 메모리 사용)
+COMPARE_CHUNK = 256
+
+# 색 비교용 RGBA 썸네일 크기 (COLOR_SIZE × COLOR_SIZE)
+COLOR_SIZE = 16
+
+# 바이트별 1비트 개수
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def collect_parts(root_dir: Path) -> List[Dict[str, Any]]:
+    """로스터 출력 폴더에서 파츠 목록 수집
+
+    이미 공유 라이브러리를 가리키는 항목은 같은 파일로 풀리므로 실제 파일당 한 번만 센다.
+    """
+    parts = []
+    seen = set()
+    for metadata_path in sorted(root_dir.glob("*/parts/metadata.json")):
+        char_dir = metadata_path.parent.parent
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        for index, part in enumerate(metadata.get("parts", [])):
+            path = (metadata_path.parent / part["file"]).resolve()
+            if path.exists() and path not in seen:
+                seen.add(path)
+                parts.append({
+                    "character_id": char_dir.name,
+                    "metadata_path": metadata_path,
+                    "index": index,
+                    "name": part["name"],
+                    "path": path,
+                })
+    return parts
+
+
+def compute_hashes(parts: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, List[str],
+                                                        List[Tuple[int, int]]]:
+    """정확한 해시, 크기, dHash, 색 썸네일을 일괄 계산
+
+    dHash는 (N, HASH_SIZE, HASH_SIZE + 1) 회색조 배열을 한 번에 비교해 만든다.
+    색 썸네일은 알파를 곱한 RGB + 알파라서 투명 픽셀의 RGB 값은 비교에 영향이 없다.
+    반환: (N, 8) uint8 dHash, (N, COLOR_SIZE, COLOR_SIZE, 4) uint8 색 썸네일,
+          SHA-256 목록, (너비, 높이) 목록
+    """
+    from PIL import Image
+
+    thumbs = np.empty((len(parts), HASH_SIZE, HASH_SIZE + 1), dtype=np.int16)
+    colors = np.empty((len(parts), COLOR_SIZE, COLOR_SIZE, 4), dtype=np.uint8)
+    digests, sizes = [], []
+    for i, part in enumerate(parts):
+        data = part["path"].read_bytes()
+        digests.append(hashlib.sha256(data).hexdigest())
+        with Image.open(part["path"]) as img:
+            sizes.append(img.size)
+            gray = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR)
+            thumbs[i] = np.asarray(gray, dtype=np.int16)
+            premultiplied = img.convert("RGBA").convert("RGBa")
+            colors[i] = np.asarray(premultiplied.resize((COLOR_SIZE, COLOR_SIZE), Image.BILINEAR),
+                                   dtype=np.uint8)
+
+    bits = thumbs[:, :, 1:] > thumbs[:, :, :-1]
+    dhashes = np.packbits(bits.reshape(len(parts), -1), axis=1)
+    return dhashes, colors, digests, sizes
+
+
+def cluster_parts(dhashes: np.ndarray, colors: np.ndarray, digests: List[str],
+                  sizes: List[Tuple[int, int]], threshold: int,
+                  color_tolerance: float) -> List[List[int]]:
+    """크기가 같고 해밍 거리가 threshold 이하이며 색 차이가 color_tolerance 이하인 파츠를 묶음
+
+    dHash는 모양만 보므로 같은 모양의 다른 색 파츠는 색 썸네일 평균 절대 차이(0~255)로 걸러낸다.
+    바이트가 같은 파일은 두 검사 없이 묶는다.
+    대표(리더) 기준으로만 묶어 A~B, B~C 연쇄로 서로 다른 A, C가 합쳐지지 않게 한다.
+    """
+    clusters = []
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, size in enumerate(sizes):
+        groups.setdefault(size, []).append(i)
+
+    for members in groups.values():
+        idx = np.array(members)
+        hashes = dhashes[idx]
+        assigned = np.zeros(len(idx), dtype=bool)
+
+        # 정확히 같은 파일은 지각 해시와 무관하게 먼저 묶는다
+        by_digest: Dict[str, List[int]] = {}
+        for local, global_index in enumerate(members):
+            by_digest.setdefault(digests[global_index], []).append(local)
+
+        for start in range(0, len(idx), COMPARE_CHUNK):
+            stop = min(start + COMPARE_CHUNK, len(idx))
+            # (chunk, N) 해밍 거리 행렬
+            distances = POPCOUNT[hashes[start:stop, None, :] ^ hashes[None, :, :]].sum(
+                axis=2, dtype=np.int32)
+            for row, leader in enumerate(range(start, stop)):
+                if assigned[leader]:
+                    continue
+                close = (distances[row] <= threshold) & ~assigned
+                candidates = np.nonzero(close)[0]
+                if len(candidates):
+                    diff = np.abs(colors[idx[candidates]].astype(np.int16)
+                                  - colors[idx[leader]].astype(np.int16)).mean(axis=(1, 2, 3))
+                    close[candidates[diff > color_tolerance]] = False
+                for twin in by_digest[digests[idx[leader]]]:
+                    close[twin] = not assigned[twin]
+                assigned |= close
+                clusters.append([int(i) for i in idx[np.nonzero(close)[0]]])
+
+    return clusters
+
+
+# 스켈레톤에 images 경로가 없을 때의 이미지 폴더 (skeleton.json 기준, 파츠 분리 출력)
+DEFAULT_IMAGES = "../parts/"
+
+
+def _attachment_path(library_file: Path, images_dir: Path) -> str:
+    """skeleton.json 어태치먼트 경로 (Spine 규칙: images 폴더 기준, 확장자 제외)"""
+    return Path(os.path.relpath(library_file.with_suffix(""), images_dir)).as_posix()
+
+
+def apply_dedup(root_dir: Path, parts: List[Dict[str, Any]], clusters: List[List[int]],
+                digests: List[str], prune: bool) -> Dict[str, Any]:
+    """공유 라이브러리 생성 및 metadata.json / skeleton.json 갱신"""
+    library_dir = root_dir / LIBRARY_DIR
+    library_dir.mkdir(parents=True, exist_ok=True)
+
+    metadata_cache: Dict[Path, Dict[str, Any]] = {}
+    shared_of: Dict[int, Path] = {}
+    for cluster in clusters:
+        if len(cluster) < 2:
+            continue
+        leader = cluster[0]
+        library_file = library_dir / f"{digests[leader][:16]}.png"
+        if not library_file.exists():
+            shutil.copy2(parts[leader]["path"], library_file)
+        for member in cluster:
+            shared_of[member] = library_file
+
+    pruned = 0
+    for member, library_file in shared_of.items():
+        part = parts[member]
+        metadata_path = part["metadata_path"]
+        if metadata_path not in metadata_cache:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata_cache[metadata_path] = json.load(f)
+        entry = metadata_cache[metadata_path]["parts"][part["index"]]
+
+        entry.setdefault("original_file", entry["file"])
+        entry["file"] = Path(os.path.relpath(library_file, metadata_path.parent)).as_posix()
+        entry["shared"] = library_file.stem
+
+        if prune and part["path"].parent == metadata_path.parent and part["path"].exists():
+            part["path"].unlink()
+            pruned += 1
+
+    for metadata_path, metadata in metadata_cache.items():
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        _update_skeleton(metadata_path.parent.parent / "spine" / "skeleton.json",
+                         metadata, root_dir)
+
+    return {"library": str(library_dir), "shared_parts": len(shared_of), "pruned": pruned,
+            "characters": len(metadata_cache)}
+
+
+def _update_skeleton(skeleton_path: Path, metadata: Dict[str, Any], root_dir: Path) -> None:
+    """공유 파츠를 가리키도록 기본 스킨의 어태치먼트 path 지정"""
+    if not skeleton_path.exists():
+        return
+    with open(skeleton_path, "r", encoding="utf-8") as f:
+        skeleton = json.load(f)
+
+    shared = {part["name"]: part for part in metadata.get("parts", []) if "shared" in part}
+    if not shared:
+        return
+    # 어태치먼트 path는 images 폴더 기준으로 해석되므로 폴더를 명시한다
+    images = skeleton.setdefault("skeleton", {}).setdefault("images", DEFAULT_IMAGES)
+    images_dir = (skeleton_path.parent / images).resolve()
+    default_skin = skeleton.setdefault("skins", {}).setdefault("default", {})
+    for slot in skeleton.get("slots", []):
+        part = shared.get(slot.get("attachment"))
+        if part is None:
+            continue
+        library_file = root_dir / LIBRARY_DIR / f"{part['shared']}.png"
+        # x/y/width/height 등 리그가 넣어 둔 값은 유지하고 path만 지정
+        attachments = default_skin.setdefault(slot["name"], {})
+        attachments.setdefault(slot["attachment"], {})["path"] = \
+            _attachment_path(library_file, images_dir)
+
+    with open(skeleton_path, "w", encoding="utf-8") as f:
+        json.dump(skeleton, f, indent=2)
+
+
+def summarize(parts: List[Dict[str, Any]], clusters: List[List[int]],
+              sizes: List[Tuple[int, int]]) -> Dict[str, Any]:
+    """중복 제거 전후 파일 크기 / 텍스처 메모리(RGBA) 비교"""
+    file_bytes = [p["path"].stat().st_size for p in parts]
+    texture_bytes = [w * h * 4 for w, h in sizes]
+    leaders = [cluster[0] for cluster in clusters]
+    return {
+        "parts": len(parts),
+        "unique": len(clusters),
+        "duplicate_groups": sum(1 for c in clusters if len(c) > 1),
+        "file_bytes": sum(file_bytes),
+        "unique_file_bytes": sum(file_bytes[i] for i in leaders),
+        "texture_bytes": sum(texture_bytes),
+        "unique_texture_bytes": sum(texture_bytes[i] for i in leaders),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캐릭터 간 파츠 중복 제거")
+    parser.add_argument("--input", type=str, required=True, help="로스터 출력 폴더")
+    parser.add_argument("--threshold", type=int, default=4,
+                        help="같은 파츠로 볼 dHash 해밍 거리 (0이면 거의 동일한 것만)")
+    parser.add_argument("--color-tolerance", type=float, default=8.0,
+                        help="같은 파츠로 볼 RGBA 썸네일 평균 절대 차이 (0~255, 알파 곱한 값)")
+    parser.add_argument("--dry-run", action="store_true", help="보고만 하고 파일은 수정하지 않음")
+    parser.add_argument("--prune", action="store_true",
+                        help="공유 라이브러리로 옮긴 캐릭터별 파츠 파일 삭제")
+    args = parser.parse_args()
+
+    root_dir = Path(args.input).resolve()
+    if not root_dir.exists():
+        console.print(f"[red]폴더를 찾을 수 없습니다: {root_dir}[/red]")
+        return
+
+    parts = collect_parts(root_dir)
+    if not parts:
+        console.print("[yellow]파츠가 없습니다[/yellow]")
+        return
+
+    console.print(f"[blue]파츠 {len(parts)}개 해시 계산 중...[/blue]")
+    dhashes, colors, digests, sizes = compute_hashes(parts)
+    clusters = cluster_parts(dhashes, colors, digests, sizes, args.threshold,
+                             args.color_tolerance)
+    summary = summarize(parts, clusters, sizes)
+
+    table = Table(title="파츠 중복 제거")
+    table.add_column("항목")
+    table.add_column("전체", justify="right")
+    table.add_column("고유", justify="right")
+    table.add_row("파츠 수", str(summary["parts"]), str(summary["unique"]))
+    table.add_row("파일 크기(MB)", f"{summary['file_bytes'] / 1e6:.2f}",
+                  f"{summary['unique_file_bytes'] / 1e6:.2f}")
+    table.add_row("텍스처 메모리(MB)", f"{summary['texture_bytes'] / 1e6:.2f}",
+                  f"{summary['unique_texture_bytes'] / 1e6:.2f}")
+    console.print(table)
+    console.print(f"[blue]중복 그룹: {summary['duplicate_groups']}개[/blue]")
+
+    if args.dry_run or not summary["duplicate_groups"]:
+        return
+
+    result = apply_dedup(root_dir, parts, clusters, digests, args.prune)
+    console.print(f"[green][OK] Shared parts: {result['shared_parts']} "
+                  f"({result['characters']} characters) -> {result['library']}[/green]")
+    if args.prune:
+        console.print(f"[green][OK] Pruned: {result['pruned']} files[/green]")
+
+
+if __name__ == "__main__":
+    main()
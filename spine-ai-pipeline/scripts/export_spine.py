@@ -4,18 +4,38 @@ Spine 프로젝트 최종 출력 및 게임 레포 배포 스크립트
 
 사용법:
     python export_spine.py --input char_001 --game mg-game-0001
+    python export_spine.py --input char_001 --game mg-game-0001 --sync
 """
 
 import argparse
+import ctypes
+import errno
+import hashlib
 import json
+import os
 import shutil
+import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Collection, Dict, Any, Optional
 
 from rich.console import Console
 
+from anim_library import (LIBRARY_DIR as ANIMATION_LIBRARY_DIR, REFERENCE_KEY,
+                          hoist_animations)
+from asset_index import AssetIndex, INDEX_NAME
+from spine_bundle import BUNDLE_SUFFIX, write_bundle
+
 console = Console()
 
+MANIFEST_NAME = "manifest.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)) - 같은 파일시스템이면 CoW 복제
+FICLONE = 0x40049409
+# renameat2 플래그
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
 
 def copy_spine_assets(source_dir: Path, target_dir: Path) -> Dict[str, Any]:
     """Spine 에셋 복사"""
@@ -36,6 +56,193 @@ def copy_spine_assets(source_dir: Path, target_dir: Path) -> Dict[str, Any]:
         return {"success": False, "error": str(e)}
 
 
+def file_sha256(path: Path) -> str:
+    """파일 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(spine_dir: Path) -> Dict[str, Any]:
+    """기존 매니페스트 로드 (없거나 손상되면 빈 dict)"""
+    manifest_path = spine_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def hash_spine_files(source_dir: Path,
+                     previous: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """소스 파일 해시 계산
+
+    이전 매니페스트에 크기와 mtime이 같은 항목이 있으면 해시를 다시 계산하지 않는다.
+    """
+    cached = {entry["name"]: entry for entry in (previous or {}).get("files", [])
+              if "sha256" in entry}
+    hashes = {}
+    for file_path in sorted(source_dir.glob("*")):
+        if not file_path.is_file() or file_path.name == MANIFEST_NAME:
+            continue
+        stat = file_path.stat()
+        entry = cached.get(file_path.name)
+        if entry and _source_size(entry) == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            sha256 = _source_sha256(entry)
+        else:
+            sha256 = file_sha256(file_path)
+        hashes[file_path.name] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+        }
+    return hashes
+
+
+def _source_sha256(entry: Dict[str, Any]) -> Optional[str]:
+    """출력 시 변환된 파일(source_sha256 기록)이면 원본 해시, 아니면 파일 해시"""
+    return entry.get("source_sha256", entry.get("sha256"))
+
+
+def _source_size(entry: Dict[str, Any]) -> Optional[int]:
+    return entry.get("source_size", entry.get("size"))
+
+
+def record_transformed(hashes: Dict[str, Dict[str, Any]], name: str, path: Path) -> None:
+    """출력 폴더에서 내용이 바뀐 파일의 해시 갱신 (원본 해시는 다음 동기화 비교용으로 보존)
+
+    mtime_ns는 원본 파일 것이고, 출력 파일 자체의 mtime은 output_mtime_ns에 둔다.
+    """
+    source = hashes[name]
+    sha256 = file_sha256(path)
+    if sha256 == _source_sha256(source):
+        return
+    stat = path.stat()
+    hashes[name] = {
+        "size": stat.st_size,
+        "mtime_ns": source["mtime_ns"],
+        "output_mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+        "source_size": _source_size(source),
+        "source_sha256": _source_sha256(source),
+    }
+
+
+def _clone_file(source: Path, target: Path) -> None:
+    """가능하면 reflink(CoW)로, 아니면 일반 복사 (mtime 보존)"""
+    if sys.platform.startswith("linux"):
+        import fcntl
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(source, target)
+            return
+        except OSError:
+            target.unlink(missing_ok=True)
+    shutil.copy2(source, target)
+
+
+def _exchange_dirs(staging_dir: Path, target_dir: Path) -> None:
+    """스테이징 폴더를 대상 위치로 교체
+
+    Linux에서는 renameat2(RENAME_EXCHANGE)로 두 경로를 원자적으로 맞바꾸고,
+    지원하지 않으면 기존 폴더를 옆으로 옮긴 뒤 rename 한다 (짧은 공백 구간 있음).
+    교체 후 이전 내용은 staging_dir 경로에 남는다.
+    """
+    if not target_dir.exists():
+        os.rename(staging_dir, target_dir)
+        staging_dir.mkdir()
+        return
+
+    if sys.platform.startswith("linux"):
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = getattr(libc, "renameat2", None)
+        if renameat2 is not None:
+            if renameat2(AT_FDCWD, os.fsencode(staging_dir),
+                         AT_FDCWD, os.fsencode(target_dir), RENAME_EXCHANGE) == 0:
+                return
+            err = ctypes.get_errno()
+            if err not in (errno.EINVAL, errno.ENOSYS, errno.EXDEV, errno.ENOTSUP):
+                raise OSError(err, os.strerror(err), str(target_dir))
+
+    backup_dir = target_dir.with_name(f".{target_dir.name}.old-{os.getpid()}")
+    os.rename(target_dir, backup_dir)
+    os.rename(staging_dir, target_dir)
+    os.rename(backup_dir, staging_dir)
+
+
+def sync_spine_assets(source_dir: Path, target_dir: Path,
+                      finalize: Optional[Callable[[Path, Dict[str, Dict[str, Any]],
+                                                   Dict[str, Any]], None]] = None,
+                      transformed: Collection[str] = ()) -> Dict[str, Any]:
+    """해시 비교 기반 증분 동기화
+
+    - 변경된 파일만 소스에서 복사하고, 변경 없는 파일은 기존 출력에서 하드링크
+    - 형제 스테이징 폴더에 구성한 뒤 통째로 교체하므로 소비자가 반쯤 복사된 상태를 보지 않음
+    - 소스에 없는 파일은 교체와 함께 사라짐
+    - finalize(staging_dir, hashes, previous_manifest)로 교체 전에 매니페스트 등을 추가할 수 있음
+    - 이전 출력에서 변환된 파일(source_sha256 기록)은 이번에도 finalize가 같은 변환을 하는
+      경우(transformed에 포함)에만 재사용하고, 아니면 소스에서 다시 복사
+
+    소스 파일은 하드링크하지 않는다 (파이프라인 스크립트가 skeleton.json을
+    제자리에서 다시 쓰므로 게임 레포 파일까지 바뀌게 됨). 같은 파일시스템이면 reflink를 쓴다.
+    """
+    staging_dir = target_dir.with_name(f".{target_dir.name}.staging-{os.getpid()}")
+    try:
+        previous = load_manifest(target_dir)
+        previous_hashes = {entry["name"]: _source_sha256(entry)
+                           for entry in previous.get("files", [])
+                           if "source_sha256" not in entry or entry["name"] in transformed}
+        hashes = hash_spine_files(source_dir, previous)
+
+        target_dir.parent.mkdir(parents=True, exist_ok=True)
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir()
+
+        copied, unchanged = [], []
+        for name, info in hashes.items():
+            existing = target_dir / name
+            if previous_hashes.get(name) == info["sha256"] and existing.is_file():
+                try:
+                    os.link(existing, staging_dir / name)
+                except OSError:
+                    _clone_file(existing, staging_dir / name)
+                unchanged.append(name)
+            else:
+                _clone_file(source_dir / name, staging_dir / name)
+                copied.append(name)
+
+        removed = []
+        if target_dir.exists():
+            removed = [p.name for p in target_dir.iterdir()
+                       if p.is_file() and p.name not in hashes and p.name != MANIFEST_NAME]
+
+        if finalize:
+            finalize(staging_dir, hashes, previous)
+
+        _exchange_dirs(staging_dir, target_dir)
+        shutil.rmtree(staging_dir)
+
+        return {
+            "success": True,
+            "files": list(hashes),
+            "copied": copied,
+            "unchanged": unchanged,
+            "removed": removed,
+            "hashes": hashes,
+        }
+
+    except Exception as e:
+        console.print(f"[red]동기화 실패: {e}[/red]")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return {"success": False, "error": str(e)}
+
+
 def generate_thumbnail(spine_dir: Path, output_path: Path) -> bool:
     """썸네일 생성 (플레이스홀더)"""
     # TODO: Spine CLI 또는 Viewer를 사용한 썸네일 생성
@@ -50,31 +257,54 @@ def optimize_images(target_dir: Path) -> Dict[str, Any]:
     return {"success": True, "optimized": 0}
 
 
-def create_manifest(character_id: str, spine_dir: Path) -> Dict[str, Any]:
-    """에셋 매니페스트 생성"""
+def summarize_skeleton(skeleton_path: Path) -> Dict[str, Any]:
+    """skeleton.json에서 본/슬롯 수와 애니메이션 목록 추출"""
+    with open(skeleton_path, "r", encoding="utf-8") as f:
+        skeleton = json.load(f)
+    return {
+        "bones": len(skeleton.get("bones", [])),
+        "slots": len(skeleton.get("slots", [])),
+        # 공유 라이브러리로 옮긴 스켈레톤은 참조 목록에서 이름을 얻는다
+        "animations": list(skeleton.get("animations") or
+                           skeleton.get(REFERENCE_KEY, {}).get("animations", {})),
+    }
+
+
+def create_manifest(character_id: str, spine_dir: Path,
+                    hashes: Optional[Dict[str, Dict[str, Any]]] = None,
+                    previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """에셋 매니페스트 생성
+
+    hashes: sync_spine_assets가 계산한 파일별 size/mtime_ns/sha256 (없으면 여기서 계산)
+    previous: 이전 매니페스트 - skeleton.json 해시가 같으면 스켈레톤을 다시 파싱하지 않음
+    """
     manifest = {
         "character_id": character_id,
         "type": "spine",
         "files": [],
+        "bones": 0,
+        "slots": 0,
         "animations": [],
     }
 
-    # 파일 목록
-    for file_path in spine_dir.glob("*"):
-        if file_path.is_file():
-            manifest["files"].append({
-                "name": file_path.name,
-                "size": file_path.stat().st_size,
-            })
-
-    # 애니메이션 목록 (skeleton.json에서 추출)
-    skeleton_path = spine_dir / "skeleton.json"
-    if skeleton_path.exists():
-        with open(skeleton_path, "r", encoding="utf-8") as f:
-            skeleton = json.load(f)
-            manifest["animations"] = list(skeleton.get("animations", {}).keys())
-
-    manifest_path = spine_dir / "manifest.json"
+    # 파일 목록 (다음 동기화 때 해시 캐시로 쓰인다)
+    if hashes is None:
+        hashes = hash_spine_files(spine_dir, previous)
+    for name, info in sorted(hashes.items()):
+        manifest["files"].append({"name": name, **info})
+
+    # 본/슬롯/애니메이션 (skeleton.json이 바뀐 경우에만 파싱)
+    skeleton_info = hashes.get("skeleton.json")
+    if skeleton_info:
+        previous_files = {entry["name"]: entry for entry in (previous or {}).get("files", [])}
+        previous_skeleton = previous_files.get("skeleton.json", {})
+        if previous_skeleton.get("sha256") == skeleton_info["sha256"] and "bones" in previous:
+            summary = {key: previous[key] for key in ("bones", "slots", "animations")}
+        else:
+            summary = summarize_skeleton(spine_dir / "skeleton.json")
+        manifest.update(summary)
+
+    manifest_path = spine_dir / MANIFEST_NAME
     with open(manifest_path, "w", encoding="utf-8") as f:
         json.dump(manifest, f, indent=2)
 
@@ -88,6 +318,16 @@ def main():
     parser.add_argument("--output", type=str, help="직접 출력 경로 지정")
     parser.add_argument("--optimize", action="store_true", help="이미지 최적화")
     parser.add_argument("--thumbnail", action="store_true", help="썸네일 생성")
+    parser.add_argument("--sync", action="store_true",
+                        help="변경된 파일만 복사하고 폴더를 원자적으로 교체")
+    parser.add_argument("--index", type=str,
+                        help="갱신할 에셋 인덱스 경로 (--game 지정 시 기본값: spine/index.sqlite)")
+    parser.add_argument("--no-index", action="store_true", help="에셋 인덱스 갱신 안 함")
+    parser.add_argument("--shared-animations", action="store_true",
+                        help="동일 애니메이션을 리그별 공유 라이브러리(spine/_animations/)로 이동")
+    parser.add_argument("--bundle", action="store_true",
+                        help="출력 폴더 옆에 단일 파일 번들(<id>.spbundle) 생성 "
+                             "(이미 있으면 지정하지 않아도 갱신)")
     args = parser.parse_args()
 
     input_dir = Path(args.input)
@@ -112,26 +352,86 @@ def main():
     console.print(f"[blue]캐릭터: {character_id}[/blue]")
     console.print(f"[blue]출력: {target_dir}[/blue]")
 
-    # 에셋 복사
-    result = copy_spine_assets(spine_dir, target_dir)
-    if not result.get("success"):
-        console.print("[red][FAIL] Export failed[/red]")
-        return
+    animation_library = target_dir.parent / ANIMATION_LIBRARY_DIR
+
+    if args.sync:
+        # 최적화/썸네일/매니페스트까지 스테이징 폴더에서 마친 뒤 교체
+        manifests = []
+
+        def finalize(staging_dir: Path, hashes: Dict[str, Dict[str, Any]],
+                     previous: Dict[str, Any]) -> None:
+            if args.optimize:
+                optimize_images(staging_dir)
+            if args.thumbnail:
+                generate_thumbnail(staging_dir, staging_dir / "thumbnail.png")
+            if args.shared_animations and "skeleton.json" in hashes:
+                hoist_animations(staging_dir / "skeleton.json", animation_library)
+                record_transformed(hashes, "skeleton.json", staging_dir / "skeleton.json")
+            manifests.append(create_manifest(character_id, staging_dir, hashes, previous))
+
+        result = sync_spine_assets(spine_dir, target_dir, finalize,
+                                   ("skeleton.json",) if args.shared_animations else ())
+        if not result.get("success"):
+            console.print("[red][FAIL] Export failed[/red]")
+            return
+
+        console.print(f"[green][OK] Files synced: {len(result['copied'])} copied, "
+                      f"{len(result['unchanged'])} unchanged, "
+                      f"{len(result['removed'])} removed[/green]")
+        manifest = manifests[0]
+    else:
+        previous = load_manifest(target_dir)
+
+        # 에셋 복사
+        result = copy_spine_assets(spine_dir, target_dir)
+        if not result.get("success"):
+            console.print("[red][FAIL] Export failed[/red]")
+            return
 
-    console.print(f"[green][OK] Files copied: {len(result.get('files', []))}[/green]")
+        console.print(f"[green][OK] Files copied: {len(result.get('files', []))}[/green]")
 
-    # 이미지 최적화
-    if args.optimize:
-        optimize_images(target_dir)
+        # 이미지 최적화
+        if args.optimize:
+            optimize_images(target_dir)
 
-    # 썸네일 생성
-    if args.thumbnail:
-        generate_thumbnail(target_dir, target_dir / "thumbnail.png")
+        # 썸네일 생성
+        if args.thumbnail:
+            generate_thumbnail(target_dir, target_dir / "thumbnail.png")
+
+        # 공유 애니메이션 라이브러리
+        if args.shared_animations and (target_dir / "skeleton.json").exists():
+            hoist_animations(target_dir / "skeleton.json", animation_library)
+
+        # 매니페스트 생성
+        manifest = create_manifest(character_id, target_dir, previous=previous)
 
-    # 매니페스트 생성
-    manifest = create_manifest(character_id, target_dir)
     console.print(f"[green][OK] Manifest created: {len(manifest['animations'])} animations[/green]")
 
+    # 단일 파일 번들 (매니페스트의 해시 재사용)
+    # 이전 export가 만든 번들이 있으면 --bundle 없이도 갱신해 폴더와 어긋나지 않게 한다
+    bundle_path = target_dir.with_name(character_id + BUNDLE_SUFFIX)
+    if args.bundle or bundle_path.exists():
+        hashes = {entry["name"]: entry for entry in manifest["files"]}
+        bundle = write_bundle(target_dir, bundle_path, hashes)
+        if bundle.get("success"):
+            console.print(f"[green][OK] Bundle created: {bundle_path} "
+                          f"({bundle['size']} bytes)[/green]")
+        else:
+            # 갱신 못 한 이전 번들은 폴더와 다르므로 남기지 않는다
+            bundle_path.unlink(missing_ok=True)
+
+    # 게임 전체 인덱스 갱신
+    index_path = None
+    if args.index:
+        index_path = Path(args.index)
+    elif args.game and not args.output:
+        index_path = target_dir.parent / INDEX_NAME
+    if index_path and not args.no_index:
+        index = AssetIndex(index_path)
+        if index.update_character(manifest):
+            console.print(f"[green][OK] Index updated: {index_path}[/green]")
+        index.close()
+
     console.print(f"[green][OK] Export complete: {target_dir}[/green]")
 
 
@@ -10,6 +10,7 @@ Stable Diffusion을 활용한 캐릭터 일러스트 생성 스크립트
 import argparse
 import json
 import os
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -17,10 +18,13 @@ import requests
 from rich.console import Console
 from rich.progress import Progress
 
+from telemetry import emit
+
 console = Console()
 
 # Stable Diffusion WebUI API 기본 설정
 SD_API_URL = os.getenv("SD_API_URL", "http://localhost:7860")
+SD_API_RETRIES = int(os.getenv("SD_API_RETRIES", "2"))
 
 
 def load_config(config_path: str) -> dict:
@@ -45,8 +49,12 @@ def generate_prompt(config: dict) -> str:
     return ", ".join(filter(None, prompt_parts))
 
 
-def call_sd_api(prompt: str, output_path: Path, config: Optional[dict] = None) -> bool:
-    """Stable Diffusion API 호출"""
+def request_image(prompt: str, config: Optional[dict] = None,
+                  session: Optional[requests.Session] = None) -> Optional[bytes]:
+    """Stable Diffusion API 호출, 생성된 PNG 바이트 반환 (실패 시 None)
+
+    session을 넘기면 연결을 재사용한다 (watch 모드처럼 여러 번 호출할 때).
+    """
     payload = {
         "prompt": prompt,
         "negative_prompt": "low quality, blurry, distorted, extra limbs",
@@ -57,27 +65,42 @@ def call_sd_api(prompt: str, output_path: Path, config: Optional[dict] = None) -
         "sampler_name": config.get("sampler", "DPM++ 2M Karras") if config else "DPM++ 2M Karras",
     }
 
-    try:
-        response = requests.post(
-            f"{SD_API_URL}/sdapi/v1/txt2img",
-            json=payload,
-            timeout=120
-        )
-        response.raise_for_status()
+    for attempt in range(SD_API_RETRIES + 1):
+        if attempt:
+            time.sleep(2 ** (attempt - 1))
+        started = time.perf_counter()
+        try:
+            response = (session or requests).post(
+                f"{SD_API_URL}/sdapi/v1/txt2img",
+                json=payload,
+                timeout=120
+            )
+            response.raise_for_status()
+            result = response.json()
+        except requests.exceptions.RequestException as e:
+            console.print(f"[red]API 호출 실패 ({attempt + 1}/{SD_API_RETRIES + 1}): {e}[/red]")
+            continue
+        finally:
+            emit(sd_latency=time.perf_counter() - started, sd_retries=attempt)
 
-        result = response.json()
         if "images" in result and result["images"]:
             import base64
-            image_data = base64.b64decode(result["images"][0])
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "wb") as f:
-                f.write(image_data)
-            return True
-        return False
+            return base64.b64decode(result["images"][0])
+        return None
+
+    return None
+
 
-    except requests.exceptions.RequestException as e:
-        console.print(f"[red]API 호출 실패: {e}[/red]")
+def call_sd_api(prompt: str, output_path: Path, config: Optional[dict] = None,
+                session: Optional[requests.Session] = None) -> bool:
+    """Stable Diffusion API 호출 후 output_path에 저장"""
+    image_data = request_image(prompt, config, session)
+    if image_data is None:
         return False
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(image_data)
+    return True
 
 
 def main():
@@ -115,6 +138,7 @@ def main():
         console.print(f"[green]✓ 생성 완료: {output_path}[/green]")
     else:
         console.print("[red]✗ 생성 실패[/red]")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+샤드별 배치 결과 요약 병합 스크립트
+
+사용법:
+    python merge_summaries.py shard0.json shard1.json shard2.json --output report.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def load_summary(summary_path: Path) -> Dict[str, Any]:
+    """샤드 요약 로드"""
+    with open(summary_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge_summaries(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """샤드 요약들을 하나의 리포트로 병합"""
+    characters: Dict[str, Dict[str, Any]] = {}
+    duplicates = []
+    shards = []
+    shard_counts = set()
+
+    for summary in summaries:
+        shard = summary.get("shard")
+        shards.append(shard)
+        if shard:
+            shard_counts.add(int(shard.split("/")[1]))
+
+        for char_id, result in summary.get("characters", {}).items():
+            if char_id in characters:
+                duplicates.append(char_id)
+            characters[char_id] = result
+
+    missing_shards = []
+    if len(shard_counts) == 1:
+        count = shard_counts.pop()
+        present = {int(s.split("/")[0]) for s in shards if s}
+        missing_shards = [f"{i}/{count}" for i in range(count) if i not in present]
+
+    statuses = [r.get("status") for r in characters.values()]
+    started = [s["started_at"] for s in summaries if "started_at" in s]
+    finished = [s["finished_at"] for s in summaries if "finished_at" in s]
+
+    return {
+        "shards": shards,
+        "missing_shards": missing_shards,
+        "duplicates": sorted(set(duplicates)),
+        "started_at": min(started) if started else None,
+        "finished_at": max(finished) if finished else None,
+        "total": len(characters),
+        "success": statuses.count("success"),
+        "failed": statuses.count("failed"),
+        "skipped": statuses.count("skipped"),
+        "characters": characters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 결과 요약 병합")
+    parser.add_argument("summaries", type=str, nargs="+", help="샤드별 요약 JSON")
+    parser.add_argument("--output", type=str, help="병합 리포트 저장 경로")
+    args = parser.parse_args()
+
+    summaries = []
+    for path_str in args.summaries:
+        summary_path = Path(path_str)
+        if not summary_path.exists():
+            console.print(f"[red]파일을 찾을 수 없습니다: {summary_path}[/red]")
+            return
+        summaries.append(load_summary(summary_path))
+
+    report = merge_summaries(summaries)
+
+    table = Table(title="배치 결과")
+    table.add_column("샤드")
+    table.add_column("전체", justify="right")
+    table.add_column("성공", justify="right")
+    table.add_column("실패", justify="right")
+    table.add_column("스킵", justify="right")
+    for summary in summaries:
+        table.add_row(str(summary.get("shard") or "-"), str(summary.get("total", 0)),
+                      str(summary.get("success", 0)), str(summary.get("failed", 0)),
+                      str(summary.get("skipped", 0)))
+    table.add_row("합계", str(report["total"]), str(report["success"]),
+                  str(report["failed"]), str(report["skipped"]), style="bold")
+    console.print(table)
+
+    if report["missing_shards"]:
+        console.print(f"[yellow]누락된 샤드: {', '.join(report['missing_shards'])}[/yellow]")
+    if report["duplicates"]:
+        console.print(f"[yellow]중복 처리된 캐릭터: {len(report['duplicates'])}개[/yellow]")
+
+    failed = [cid for cid, r in report["characters"].items() if r.get("status") == "failed"]
+    if failed:
+        console.print(f"[red]실패: {', '.join(failed)}[/red]")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        console.print(f"[blue]리포트 저장: {output_path}[/blue]")
+
+
+if __name__ == "__main__":
+    main()
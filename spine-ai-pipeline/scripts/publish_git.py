@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+게임 레포에 Spine 출력물을 커밋 하나로 반영 (git fast-import)
+
+캐릭터마다 git add / git commit을 돌리면 로스터 전체에서 매우 느리고 히스토리도 커밋 수천 개로 불어난다.
+spine/ 아래의 바뀐 파일만 fast-import 스트림으로 보내 현재 브랜치에 커밋 하나를 만든다.
+
+- 파일 내용 해시는 export_spine.py가 매니페스트에 남긴 sha256을 그대로 쓴다.
+- sha256 → git blob 대응표를 .git/spine-publish.json에 저장해, HEAD 트리에 이미 있는 내용은
+  읽지도 보내지도 않는다. 대응표에 없는 파일(새 클론, 다른 빌드 노드)은
+  git hash-object로 blob id만 계산해 HEAD와 비교한다.
+- --characters로 골라도 _animations 같은 공유 폴더(_ 접두사)의 추가/변경은 함께 올린다.
+- 네트워크 없이 로컬 레포에서만 동작한다 (push는 하지 않음).
+
+사용법:
+    python publish_git.py --repo ../mg-game-0001
+    python publish_git.py --game mg-game-0001 --characters char_001 char_002 --dry-run
+    python publish_git.py --repo ../mg-game-0001 --message "Add chapter 3 characters"
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from asset_index import INDEX_NAME
+from export_spine import MANIFEST_NAME, file_sha256
+from spine_bundle import BUNDLE_SUFFIX
+
+console = Console()
+
+STATE_NAME = "spine-publish.json"
+STATE_VERSION = 1
+FILE_MODE = "100644"
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# 레포에 올리지 않는 파일 (SQLite 인덱스는 export 때마다 바뀌는 바이너리라 기본 제외)
+INDEX_NAMES = {INDEX_NAME, INDEX_NAME + "-wal", INDEX_NAME + "-shm", INDEX_NAME + "-journal"}
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(["git", "-C", str(repo), *args], capture_output=True)
+    if result.returncode != 0:
+        raise GitError(f"git {' '.join(args)}: "
+                       f"{result.stderr.decode('utf-8', errors='replace').strip()}")
+    return result.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def _load_state(state_path: Path) -> Dict[str, Any]:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"blobs": {}, "files": {}}
+    if state.get("version") != STATE_VERSION:
+        return {"blobs": {}, "files": {}}
+    return state
+
+
+def _save_state(state_path: Path, state: Dict[str, Any]) -> None:
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, **state}, f)
+    os.replace(tmp_path, state_path)
+
+
+def _has_commits(repo: Path) -> bool:
+    try:
+        _git(repo, "rev-parse", "-q", "--verify", "HEAD^{commit}")
+        return True
+    except GitError:
+        return False
+
+
+def head_tree(repo: Path, prefix: str) -> Dict[str, str]:
+    """HEAD 트리에서 prefix 아래 파일 경로 → blob sha1 (커밋이 없으면 빈 dict)"""
+    if not _has_commits(repo):
+        return {}
+    tree = {}
+    args = ["ls-tree", "-r", "-z", "--full-tree", "HEAD"] + (["--", prefix] if prefix else [])
+    for record in _git(repo, *args).split("\0"):
+        if not record:
+            continue
+        meta, path = record.split("\t", 1)
+        _, kind, sha1 = meta.split()
+        if kind == "blob":
+            tree[path] = sha1
+    return tree
+
+
+def _is_published(rel_path: Path, include_index: bool) -> bool:
+    if any(part.startswith(".") for part in rel_path.parts):
+        return False  # 스테이징 폴더, 잠금/임시 파일
+    return include_index or rel_path.name not in INDEX_NAMES
+
+
+def _group_of(rel_path: str) -> str:
+    """경로가 속한 캐릭터 (spine/<id>/... 또는 spine/<id>.spbundle)"""
+    top = rel_path.split("/", 1)[0]
+    return top[:-len(BUNDLE_SUFFIX)] if top.endswith(BUNDLE_SUFFIX) else top
+
+
+def _is_shared(group: str) -> bool:
+    """_animations 등 여러 캐릭터가 참조하는 공유 폴더"""
+    return group.startswith("_")
+
+
+def collect_files(spine_root: Path, characters: Optional[List[str]],
+                  include_index: bool) -> Dict[str, Path]:
+    """올릴 파일 목록 (spine 폴더 기준 상대 경로 → 파일)"""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(spine_root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            rel_path = path.relative_to(spine_root)
+            if not _is_published(rel_path, include_index):
+                continue
+            group = _group_of(rel_path.as_posix())
+            # 공유 폴더는 고른 캐릭터의 스켈레톤이 참조할 수 있으므로 항상 포함
+            if characters is not None and group not in characters and not _is_shared(group):
+                continue
+            files[rel_path.as_posix()] = path
+    return files
+
+
+def resolve_hashes(spine_root: Path, files: Dict[str, Path],
+                   cached: Dict[str, List[Any]]) -> Tuple[Dict[str, str], Dict[str, List[Any]]]:
+    """파일별 sha256
+
+    캐릭터 폴더 파일은 매니페스트 해시(크기와 mtime이 같을 때), 그 외에는 이전 실행의
+    (크기, mtime) 캐시를 쓰고, 둘 다 없을 때만 파일을 읽는다.
+    출력 시 변환된 파일(source_sha256 기록)은 mtime_ns가 원본 것이므로 output_mtime_ns와 비교한다.
+    """
+    manifests: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    hashes, stat_cache = {}, {}
+    for rel_path, path in files.items():
+        stat = path.stat()
+        sha256 = None
+
+        parts = rel_path.split("/")
+        if len(parts) == 2:
+            if parts[0] not in manifests:
+                manifest_path = spine_root / parts[0] / MANIFEST_NAME
+                entries = {}
+                if manifest_path.exists():
+                    try:
+                        with open(manifest_path, "r", encoding="utf-8") as f:
+                            entries = {e["name"]: e for e in json.load(f).get("files", [])}
+                    except (OSError, json.JSONDecodeError, KeyError):
+                        entries = {}
+                manifests[parts[0]] = entries
+            entry = manifests[parts[0]].get(parts[1])
+            mtime_key = "output_mtime_ns" if entry and "source_sha256" in entry else "mtime_ns"
+            if (entry and entry.get("size") == stat.st_size and entry.get("sha256")
+                    and entry.get(mtime_key) == stat.st_mtime_ns):
+                sha256 = entry["sha256"]
+
+        if sha256 is None:
+            previous = cached.get(rel_path)
+            if previous and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+                sha256 = previous[2]
+            else:
+                sha256 = file_sha256(path)
+            stat_cache[rel_path] = [stat.st_size, stat.st_mtime_ns, sha256]
+
+        hashes[rel_path] = sha256
+    return hashes, stat_cache
+
+
+def hash_blobs(repo: Path, paths: List[Path]) -> List[str]:
+    """파일의 git blob id (오브젝트는 쓰지 않음, fast-import와 같게 필터 없이)"""
+    if not paths:
+        return []
+    result = subprocess.run(
+        ["git", "-C", str(repo), "hash-object", "--no-filters", "--stdin-paths"],
+        input="".join(f"{path}\n" for path in paths).encode("utf-8", errors="surrogateescape"),
+        capture_output=True)
+    if result.returncode != 0:
+        raise GitError(f"git hash-object: "
+                       f"{result.stderr.decode('utf-8', errors='replace').strip()}")
+    sha1s = result.stdout.decode("ascii").split()
+    if len(sha1s) != len(paths):
+        raise GitError("git hash-object: 결과 개수가 파일 수와 다릅니다")
+    return sha1s
+
+
+def plan_publish(prefix: str, files: Dict[str, Path], hashes: Dict[str, str],
+                 tree: Dict[str, str], blobs: Dict[str, str],
+                 characters: Optional[List[str]], include_index: bool) -> Dict[str, Any]:
+    """HEAD 트리와 비교해 보낼 blob / 재사용할 blob / 삭제할 경로 결정"""
+    present = set(tree.values())
+    upload, reuse, unchanged = [], [], 0
+    for rel_path in files:
+        git_path = f"{prefix}/{rel_path}" if prefix else rel_path
+        sha1 = blobs.get(hashes[rel_path])
+        if sha1 and tree.get(git_path) == sha1:
+            unchanged += 1
+        elif sha1 and sha1 in present:
+            reuse.append((git_path, sha1))  # 같은 내용이 다른 경로에 이미 있음
+        else:
+            upload.append((git_path, rel_path))
+
+    deleted = []
+    for git_path in sorted(tree):
+        rel_path = git_path[len(prefix) + 1:] if prefix else git_path
+        if rel_path in files or not _is_published(Path(rel_path), include_index):
+            continue
+        # 공유 폴더 파일은 다른 캐릭터가 참조할 수 있으므로 캐릭터 지정 시 지우지 않는다
+        if characters is not None and _group_of(rel_path) not in characters:
+            continue
+        deleted.append(git_path)
+
+    changed = {_group_of(p[len(prefix) + 1:] if prefix else p)
+               for p in [path for path, _ in upload + reuse] + deleted}
+    return {"upload": upload, "reuse": reuse, "delete": deleted, "unchanged": unchanged,
+            # _animations 등 공유 폴더는 캐릭터 수에서 뺀다
+            "characters": sorted(g for g in changed if not _is_shared(g)),
+            "shared": sorted(g for g in changed if _is_shared(g))}
+
+
+def _write_blob(stream, mark: int, path: Path) -> None:
+    size = path.stat().st_size
+    stream.write(f"blob\nmark :{mark}\ndata {size}\n".encode("ascii"))
+    remaining = size
+    with open(path, "rb") as f:
+        while remaining:
+            chunk = f.read(min(remaining, STREAM_CHUNK_SIZE))
+            if not chunk:
+                raise IOError(f"파일이 읽는 중 짧아졌습니다: {path}")
+            stream.write(chunk)
+            remaining -= len(chunk)
+    stream.write(b"\n")
+
+
+def _quote_path(path: str) -> str:
+    """fast-import 경로 (따옴표로 시작하거나 줄바꿈이 있으면 C 스타일 따옴표)"""
+    if path.startswith('"') or "\n" in path:
+        return json.dumps(path, ensure_ascii=False)
+    return path
+
+
+def _default_message(plan: Dict[str, Any]) -> str:
+    characters = plan["characters"]
+    lines = [f"Publish Spine assets ({len(characters)} characters)", ""]
+    lines += [f"- {name}" for name in characters + plan["shared"]]
+    return "\n".join(lines) + "\n"
+
+
+def publish(repo: Path, spine_root: Optional[Path] = None,
+            characters: Optional[List[str]] = None, message: Optional[str] = None,
+            include_index: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    """spine 폴더의 변경분을 현재 브랜치에 커밋 하나로 기록"""
+    try:
+        repo = Path(_git(repo, "rev-parse", "--show-toplevel").strip()).resolve()
+        git_dir = Path(_git(repo, "rev-parse", "--absolute-git-dir").strip())
+        spine_root = (spine_root or repo / "spine").resolve()
+        prefix = spine_root.relative_to(repo).as_posix()
+        prefix = "" if prefix == "." else prefix
+
+        try:
+            branch = _git(repo, "symbolic-ref", "-q", "HEAD").strip()
+        except GitError:
+            raise GitError("HEAD가 브랜치를 가리키지 않습니다 (detached HEAD)")
+        tree = head_tree(repo, prefix)
+        parent = _git(repo, "rev-parse", "HEAD").strip() if _has_commits(repo) else None
+
+        state_path = git_dir / STATE_NAME
+        state = _load_state(state_path)
+        files = collect_files(spine_root, characters, include_index) if spine_root.exists() else {}
+        hashes, stat_cache = resolve_hashes(spine_root, files, state.get("files", {}))
+
+        # 대응표에 없는 내용은 blob id만 계산 (HEAD와 같으면 올리지 않음)
+        blobs = dict(state.get("blobs", {}))
+        unknown = sorted({hashes[rel_path]: rel_path for rel_path in files
+                          if hashes[rel_path] not in blobs}.items())
+        sha1s = hash_blobs(repo, [files[rel_path] for _, rel_path in unknown])
+        blobs.update((sha256, sha1) for (sha256, _), sha1 in zip(unknown, sha1s))
+
+        plan = plan_publish(prefix, files, hashes, tree, blobs, characters, include_index)
+
+        result = {"success": True, "commit": None, "branch": branch,
+                  "uploaded": len(plan["upload"]), "reused": len(plan["reuse"]),
+                  "deleted": len(plan["delete"]), "unchanged": plan["unchanged"],
+                  "characters": plan["characters"]}
+
+        if dry_run:
+            return result
+        if not (plan["upload"] or plan["reuse"] or plan["delete"]):
+            if unknown:
+                _save_state(state_path, {"blobs": blobs, "files": stat_cache})
+            return result
+
+        author = _git(repo, "var", "GIT_AUTHOR_IDENT").strip()
+        committer = _git(repo, "var", "GIT_COMMITTER_IDENT").strip()
+        message_bytes = (message or _default_message(plan)).encode("utf-8")
+
+        with tempfile.NamedTemporaryFile(dir=git_dir, prefix="spine-publish-",
+                                         suffix=".marks", delete=False) as marks_file:
+            marks_path = Path(marks_file.name)
+        try:
+            proc = subprocess.Popen(
+                ["git", "-C", str(repo), "fast-import", "--quiet", "--done",
+                 f"--export-marks={marks_path}"],
+                stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+            stream = proc.stdin
+            try:
+                marks = {}
+                for mark, (git_path, rel_path) in enumerate(plan["upload"], 1):
+                    _write_blob(stream, mark, files[rel_path])
+                    marks[git_path] = mark
+
+                commit_mark = len(plan["upload"]) + 1
+                stream.write(f"commit {branch}\nmark :{commit_mark}\n".encode("ascii"))
+                stream.write(f"author {author}\ncommitter {committer}\n".encode("utf-8"))
+                stream.write(f"data {len(message_bytes)}\n".encode("ascii") + message_bytes + b"\n")
+                if parent:
+                    stream.write(f"from {parent}\n".encode("ascii"))
+                for git_path in plan["delete"]:
+                    stream.write(f"D {_quote_path(git_path)}\n".encode("utf-8"))
+                for git_path, sha1 in plan["reuse"]:
+                    stream.write(f"M {FILE_MODE} {sha1} {_quote_path(git_path)}\n".encode("utf-8"))
+                for git_path, mark in marks.items():
+                    stream.write(f"M {FILE_MODE} :{mark} {_quote_path(git_path)}\n".encode("utf-8"))
+                stream.write(b"\ndone\n")
+                stream.close()
+            except BrokenPipeError:
+                pass
+            stderr = proc.stderr.read().decode("utf-8", errors="replace")
+            if proc.wait() != 0:
+                # 다른 커밋이 먼저 들어와 fast-forward가 아니면 여기서 실패한다
+                raise GitError(f"git fast-import: {stderr.strip()}")
+
+            exported = {}
+            for line in marks_path.read_text(encoding="ascii").splitlines():
+                mark, sha1 = line.split()
+                exported[int(mark[1:])] = sha1
+        finally:
+            marks_path.unlink(missing_ok=True)
+
+        commit = exported[commit_mark]
+        if parent and (_git(repo, "rev-parse", f"{commit}^{{tree}}")
+                       == _git(repo, "rev-parse", f"{parent}^{{tree}}")):
+            # 계획상 나올 수 없지만, 빈 커밋은 히스토리에 남기지 않는다
+            _git(repo, "update-ref", branch, parent, commit)
+            commit = None
+
+        # 인덱스를 새 커밋에 맞춤 (작업 트리는 이미 같은 내용)
+        _git(repo, "reset", "-q", "HEAD", "--", prefix or ".")
+
+        for git_path, rel_path in plan["upload"]:
+            blobs[hashes[rel_path]] = exported[marks[git_path]]
+        # 현재 트리에 남은 blob만 보관 (대응표가 끝없이 커지지 않게)
+        live = set(head_tree(repo, prefix).values())
+        _save_state(state_path, {
+            "blobs": {sha256: sha1 for sha256, sha1 in blobs.items() if sha1 in live},
+            "files": stat_cache,
+        })
+
+        result["commit"] = commit
+        return result
+
+    except (GitError, OSError, ValueError) as e:
+        console.print(f"[red]게임 레포 커밋 실패: {e}[/red]")
+        return {"success": False, "error": str(e)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spine 출력물을 게임 레포에 커밋 하나로 반영")
+    parser.add_argument("--repo", type=str, help="게임 레포 경로")
+    parser.add_argument("--game", type=str, help="게임 레포 이름 (예: mg-game-0001)")
+    parser.add_argument("--root", type=str, help="spine 폴더 경로 (기본: <레포>/spine)")
+    parser.add_argument("--characters", type=str, nargs="+",
+                        help="반영할 캐릭터 (기본: spine 폴더 전체, 없어진 캐릭터는 삭제)")
+    parser.add_argument("--message", type=str, help="커밋 메시지")
+    parser.add_argument("--include-index", action="store_true",
+                        help=f"에셋 인덱스({INDEX_NAME})도 커밋")
+    parser.add_argument("--dry-run", action="store_true", help="변경 내용만 출력")
+    args = parser.parse_args()
+
+    if args.repo:
+        repo = Path(args.repo)
+    elif args.game:
+        repo = Path(__file__).parent.parent.parent.parent / args.game
+    else:
+        console.print("[red]--repo 또는 --game 중 하나를 지정하세요[/red]")
+        return
+
+    if not repo.exists():
+        console.print(f"[red]레포를 찾을 수 없습니다: {repo}[/red]")
+        return
+
+    result = publish(repo, Path(args.root) if args.root else None, args.characters,
+                     args.message, args.include_index, args.dry_run)
+    if not result["success"]:
+        raise SystemExit(1)
+
+    console.print(f"[blue]캐릭터 {len(result['characters'])}개 변경: "
+                  f"{result['uploaded']} uploaded, {result['reused']} reused, "
+                  f"{result['deleted']} deleted, {result['unchanged']} unchanged[/blue]")
+    if result["commit"]:
+        console.print(f"[green][OK] Committed {result['commit'][:12]} "
+                      f"on {result['branch']}[/green]")
+    elif not args.dry_run:
+        console.print("[yellow]변경 사항이 없습니다[/yellow]")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ Spine2D AI를 활용한 리깅 자동 생성 스크립트
 import argparse
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from rich.console import Console
 
@@ -88,12 +88,19 @@ def call_spine_ai_api(parts_dir: Path, preset: str) -> Dict[str, Any]:
     return {"success": False, "method": "api"}
 
 
-def generate_local(parts_dir: Path, output_dir: Path, preset: str) -> Dict[str, Any]:
-    """로컬에서 기본 Spine 프로젝트 생성"""
+def generate_local(parts_dir: Path, output_dir: Path, preset: str,
+                   presets: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """로컬에서 기본 Spine 프로젝트 생성
+
+    presets: 이미 읽어 둔 presets.json 내용 (없으면 파일에서 로드)
+    """
     try:
         config_dir = Path(__file__).parent.parent / "config"
         parts_metadata = load_parts_metadata(parts_dir)
-        rig_preset = load_rig_preset(preset, config_dir)
+        if presets is None:
+            rig_preset = load_rig_preset(preset, config_dir)
+        else:
+            rig_preset = presets.get("rig_types", {}).get(preset, {})
 
         if not rig_preset:
             rig_preset = {"bones": ["root", "body", "head"]}
@@ -135,7 +142,7 @@ def main():
 
     if not parts_dir.exists():
         console.print(f"[red]폴더를 찾을 수 없습니다: {parts_dir}[/red]")
-        return
+        raise SystemExit(1)
 
     console.print(f"[blue]입력: {parts_dir}[/blue]")
     console.print(f"[blue]프리셋: {args.preset}[/blue]")
@@ -153,6 +160,7 @@ def main():
         console.print(f"[green]  Bones: {result.get('bones')}, Slots: {result.get('slots')}[/green]")
     else:
         console.print("[red][FAIL] Rigging failed[/red]")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+캐릭터 로스터 스트리밍 로더 및 샤딩 모듈
+
+CSV / JSON 배열 / JSON Lines 로스터를 전체 메모리 적재 없이 한 건씩 읽고,
+character_id의 안정 해시로 여러 빌드 노드에 결정적으로 분배한다.
+"""
+
+import csv
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# JSON 배열 스트리밍 시 한 번에 읽는 크기
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_characters_csv(csv_path: Path) -> Iterator[Dict[str, Any]]:
+    """CSV에서 캐릭터를 한 건씩 로드"""
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def iter_characters_jsonl(jsonl_path: Path) -> Iterator[Dict[str, Any]]:
+    """JSON Lines에서 캐릭터를 한 건씩 로드"""
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{jsonl_path}:{line_no}: 잘못된 JSON - {e}") from e
+
+
+def iter_characters_json(json_path: Path) -> Iterator[Dict[str, Any]]:
+    """JSON 배열에서 캐릭터를 한 건씩 로드
+
+    최상위가 배열이면 원소 단위로 스트리밍하고,
+    {"characters": [...]} 형태는 기존과 같이 전체를 읽는다.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_path, "r", encoding="utf-8") as f:
+        buffer = f.read(CHUNK_SIZE)
+        pos = _skip_whitespace(buffer, 0)
+
+        if pos >= len(buffer) or buffer[pos] != "[":
+            # 객체 형태: 스트리밍 불가, 전체 로드
+            data = json.loads(buffer + f.read())
+            if isinstance(data, list):
+                yield from data
+            else:
+                yield from data.get("characters", [])
+            return
+
+        pos += 1
+        eof = False
+        expect_item = True
+        while True:
+            pos = _skip_whitespace(buffer, pos)
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"{json_path}: JSON 배열이 닫히지 않았습니다")
+                buffer, pos, eof = _refill(f, buffer, pos)
+                continue
+
+            char = buffer[pos]
+            if char == "]":
+                return
+            if char == "," and not expect_item:
+                pos += 1
+                expect_item = True
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                buffer, pos, eof = _refill(f, buffer, pos)
+                continue
+
+            # 버퍼 끝에서 끝난 값은 잘렸을 수 있으므로 더 읽고 다시 해석
+            if end >= len(buffer) and not eof:
+                buffer, pos, eof = _refill(f, buffer, pos)
+                continue
+
+            yield item
+            pos = end
+            expect_item = False
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    """공백 건너뛰기"""
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _refill(f, buffer: str, pos: int) -> Tuple[str, int, bool]:
+    """처리한 앞부분을 버리고 다음 청크를 이어 붙임"""
+    chunk = f.read(CHUNK_SIZE)
+    return buffer[pos:] + chunk, 0, not chunk
+
+
+def iter_characters(path: Path) -> Iterator[Dict[str, Any]]:
+    """확장자에 맞는 스트리밍 로더 선택"""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return iter_characters_csv(path)
+    if suffix in (".jsonl", ".ndjson"):
+        return iter_characters_jsonl(path)
+    return iter_characters_json(path)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """'i/N' 형식의 샤드 지정 파싱 (i는 0부터 시작)"""
+    try:
+        index_str, count_str = spec.split("/")
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"샤드 형식은 i/N 이어야 합니다: {spec}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"샤드 범위가 잘못되었습니다: {spec}")
+    return index, count
+
+
+def shard_of(character_id: str, shard_count: int) -> int:
+    """character_id의 안정 해시로 샤드 번호 계산
+
+    파이썬 내장 hash()는 프로세스마다 달라지므로 SHA-1을 사용한다.
+    """
+    digest = hashlib.sha1(character_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def iter_shard(characters: Iterator[Dict[str, Any]],
+               index: int, count: int) -> Iterator[Dict[str, Any]]:
+    """해당 샤드에 속하는 캐릭터만 통과"""
+    for character in characters:
+        char_id = str(character.get("character_id", "unknown"))
+        if shard_of(char_id, count) == index:
+            yield character
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Spine 캐릭터 단일 파일 번들 (.spbundle)
+
+캐릭터 폴더(skeleton.json, 파츠 PNG, manifest.json)를 하나의 파일로 묶어
+기기에서 캐릭터당 파일 열기를 한 번으로 줄인다.
+공유 애니메이션 라이브러리를 참조하는 skeleton.json은 번들 밖(../_animations)을 가리키므로
+애니메이션을 복원한 독립 스켈레톤으로 넣는다.
+
+형식 (리틀 엔디언):
+    헤더      magic(8) version(u16) flags(u16) count(u32) names_size(u32) data_offset(u32)
+    인덱스    count × [offset(u64) length(u64) name_offset(u32) name_length(u32) sha256(32)]
+    이름 표   UTF-8 이름 연결
+    데이터    각 에셋은 ALIGNMENT 경계에서 시작
+
+사용법:
+    python spine_bundle.py pack output/char_001/spine --output char_001.spbundle
+    python spine_bundle.py verify char_001.spbundle
+    python spine_bundle.py bench ../mg-game-0001/spine --repeat 5
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from anim_library import REFERENCE_KEY, inflate_skeleton
+
+console = Console()
+
+MAGIC = b"SPBUNDLE"
+VERSION = 1
+ALIGNMENT = 64
+BUNDLE_SUFFIX = ".spbundle"
+
+HEADER = struct.Struct("<8sHHIII")
+ENTRY = struct.Struct("<QQII32s")
+
+# 번들 앞쪽에 둘 파일 (로더가 먼저 읽는 순서)
+PRIORITY_NAMES = ("manifest.json", "skeleton.json")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _ordered_files(spine_dir: Path) -> List[Path]:
+    files = [p for p in spine_dir.iterdir() if p.is_file() and not p.name.startswith(".")]
+    rank = {name: i for i, name in enumerate(PRIORITY_NAMES)}
+    return sorted(files, key=lambda p: (rank.get(p.name, len(rank)), p.name))
+
+
+def _standalone_skeleton(skeleton_path: Path) -> Optional[bytes]:
+    """공유 애니메이션 참조 스켈레톤이면 복원한 내용, 아니면 None"""
+    with open(skeleton_path, "r", encoding="utf-8") as f:
+        skeleton = json.load(f)
+    if REFERENCE_KEY not in skeleton:
+        return None
+    inflated = inflate_skeleton(skeleton, skeleton_path.parent)
+    return json.dumps(inflated, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_bundle(spine_dir: Path, bundle_path: Path,
+                 hashes: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """캐릭터 폴더를 번들로 저장
+
+    hashes: export_spine 매니페스트의 파일별 sha256 (있으면 재계산하지 않음)
+    참조 형식 skeleton.json은 복원한 내용으로 넣고 해시도 새로 계산한다.
+    임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 쓰다 만 번들을 보지 않는다.
+    """
+    try:
+        files = _ordered_files(spine_dir)
+        inflated = {}
+        skeleton_path = spine_dir / "skeleton.json"
+        if skeleton_path.is_file():
+            standalone = _standalone_skeleton(skeleton_path)
+            if standalone is not None:
+                inflated[skeleton_path.name] = standalone
+        names = [p.name.encode("utf-8") for p in files]
+        names_blob = b"".join(names)
+        index_end = HEADER.size + ENTRY.size * len(files) + len(names_blob)
+        data_offset = _align(index_end)
+
+        entries = []
+        offset = data_offset
+        name_offset = 0
+        for file_path, name in zip(files, names):
+            content = inflated.get(file_path.name)
+            if content is not None:
+                length = len(content)
+                digest = hashlib.sha256(content).digest()
+            else:
+                length = file_path.stat().st_size
+                known = (hashes or {}).get(file_path.name, {}).get("sha256")
+                digest = bytes.fromhex(known) if known else _file_digest(file_path)
+            entries.append((offset, length, name_offset, len(name), digest))
+            name_offset += len(name)
+            offset = _align(offset + length)
+
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = bundle_path.with_name(bundle_path.name + ".tmp")
+        with open(tmp_path, "wb") as out:
+            out.write(HEADER.pack(MAGIC, VERSION, 0, len(files), len(names_blob), data_offset))
+            for entry in entries:
+                out.write(ENTRY.pack(*entry))
+            out.write(names_blob)
+            for file_path, (entry_offset, length, _, _, _) in zip(files, entries):
+                out.write(b"\0" * (entry_offset - out.tell()))
+                if file_path.name in inflated:
+                    out.write(inflated[file_path.name])
+                    continue
+                with open(file_path, "rb") as src:
+                    _copy_exact(src, out, length)
+        os.replace(tmp_path, bundle_path)
+
+        return {"success": True, "output": str(bundle_path), "files": len(files),
+                "size": bundle_path.stat().st_size}
+
+    except Exception as e:
+        console.print(f"[red]번들 생성 실패: {e}[/red]")
+        return {"success": False, "error": str(e)}
+
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _copy_exact(src, dst, length: int) -> None:
+    remaining = length
+    while remaining:
+        chunk = src.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            raise IOError(f"파일이 읽는 중 짧아졌습니다: {src.name}")
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+class BundleReader:
+    """mmap 기반 번들 리더
+
+    get()은 복사 없이 mmap 위의 memoryview 조각을 돌려준다.
+    close() 전에 받은 memoryview를 모두 release 해야 한다 (파이썬 mmap 제약).
+    """
+
+    def __init__(self, bundle_path: Path):
+        self.path = Path(bundle_path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"빈 파일입니다: {self.path}")
+        self._view = memoryview(self._mmap)
+        self.entries = self._parse_index()
+
+    def _parse_index(self) -> Dict[str, Dict[str, Any]]:
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"번들 헤더가 잘렸습니다: {self.path}")
+        magic, version, _, count, names_size, data_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"번들 형식이 아닙니다: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"지원하지 않는 번들 버전: {version}")
+
+        names_start = HEADER.size + ENTRY.size * count
+        if names_start + names_size > len(self._mmap):
+            raise ValueError(f"번들 인덱스가 잘렸습니다: {self.path}")
+
+        entries = {}
+        for i in range(count):
+            offset, length, name_offset, name_length, digest = \
+                ENTRY.unpack_from(self._mmap, HEADER.size + ENTRY.size * i)
+            start = names_start + name_offset
+            name = bytes(self._mmap[start:start + name_length]).decode("utf-8")
+            entries[name] = {"offset": offset, "length": length, "sha256": digest.hex()}
+        self.data_offset = data_offset
+        return entries
+
+    @property
+    def size(self) -> int:
+        return len(self._mmap)
+
+    def names(self) -> List[str]:
+        return list(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def get(self, name: str) -> memoryview:
+        """에셋 바이트 (복사 없는 memoryview)"""
+        entry = self.entries[name]
+        return self._view[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def verify_bundle(bundle_path: Path) -> Dict[str, Any]:
+    """번들 구조 및 에셋 해시 검증"""
+    errors = []
+    try:
+        reader = BundleReader(bundle_path)
+    except (OSError, ValueError, struct.error) as e:
+        return {"success": False, "errors": [str(e)], "files": 0}
+
+    with reader:
+        size = reader.size
+        previous_end = reader.data_offset
+        for name, entry in sorted(reader.entries.items(), key=lambda item: item[1]["offset"]):
+            end = entry["offset"] + entry["length"]
+            if entry["offset"] % ALIGNMENT:
+                errors.append(f"{name}: 정렬되지 않은 오프셋 {entry['offset']}")
+            if entry["offset"] < previous_end or end > size:
+                errors.append(f"{name}: 범위 오류 ({entry['offset']}..{end}, 파일 {size})")
+                continue
+            previous_end = end
+            view = reader.get(name)
+            digest = hashlib.sha256(view).hexdigest()
+            view.release()
+            if digest != entry["sha256"]:
+                errors.append(f"{name}: 해시 불일치")
+        count = len(reader.entries)
+
+    return {"success": not errors, "errors": errors, "files": count}
+
+
+def _load_loose(char_dir: Path) -> int:
+    """폴더 방식 로드: 파일마다 open + read"""
+    checksum = 0
+    for file_path in char_dir.iterdir():
+        if file_path.is_file():
+            with open(file_path, "rb") as f:
+                checksum ^= zlib.crc32(f.read())
+    return checksum
+
+
+def _load_bundle(bundle_path: Path) -> int:
+    """번들 방식 로드: mmap 한 번 + memoryview 조각"""
+    checksum = 0
+    with BundleReader(bundle_path) as reader:
+        for name in reader.names():
+            view = reader.get(name)
+            checksum ^= zlib.crc32(view)
+            view.release()
+    return checksum
+
+
+def bench_load(spine_root: Path, repeat: int) -> Dict[str, Any]:
+    """게임 spine 폴더 전체를 폴더/번들 방식으로 읽는 시간 비교 (페이지 캐시가 데워진 상태)"""
+    pairs = []
+    for char_dir in sorted(spine_root.iterdir()):
+        bundle_path = spine_root / f"{char_dir.name}{BUNDLE_SUFFIX}"
+        if char_dir.is_dir() and not char_dir.name.startswith(".") and bundle_path.exists():
+            pairs.append((char_dir, bundle_path))
+
+    loose_times, bundle_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for char_dir, _ in pairs:
+            _load_loose(char_dir)
+        loose_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for _, bundle_path in pairs:
+            _load_bundle(bundle_path)
+        bundle_times.append(time.perf_counter() - started)
+
+    return {
+        "characters": len(pairs),
+        "loose": min(loose_times) if loose_times else 0.0,
+        "bundle": min(bundle_times) if bundle_times else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spine 캐릭터 번들 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack = sub.add_parser("pack", help="캐릭터 spine 폴더를 번들로 묶기")
+    pack.add_argument("input", type=str, help="spine 폴더")
+    pack.add_argument("--output", type=str, help="번들 경로 (기본: <폴더>.spbundle)")
+
+    verify = sub.add_parser("verify", help="번들 검증")
+    verify.add_argument("bundles", type=str, nargs="+", help="번들 파일")
+
+    bench = sub.add_parser("bench", help="폴더 대비 번들 로드 시간 측정")
+    bench.add_argument("root", type=str, help="게임 레포 spine 폴더")
+    bench.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최솟값 사용)")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        spine_dir = Path(args.input)
+        if not spine_dir.is_dir():
+            console.print(f"[red]폴더를 찾을 수 없습니다: {spine_dir}[/red]")
+            return
+        output = Path(args.output) if args.output else spine_dir.with_name(
+            spine_dir.name + BUNDLE_SUFFIX)
+        result = write_bundle(spine_dir, output)
+        if result["success"]:
+            console.print(f"[green][OK] Bundle: {output} "
+                          f"({result['files']} files, {result['size']} bytes)[/green]")
+
+    elif args.command == "verify":
+        failed = False
+        for path_str in args.bundles:
+            result = verify_bundle(Path(path_str))
+            if result["success"]:
+                console.print(f"[green][OK] {path_str}: {result['files']} files[/green]")
+            else:
+                failed = True
+                console.print(f"[red][FAIL] {path_str}[/red]")
+                for error in result["errors"]:
+                    console.print(f"[red]  {error}[/red]")
+        if failed:
+            raise SystemExit(1)
+
+    elif args.command == "bench":
+        result = bench_load(Path(args.root), args.repeat)
+        table = Table(title=f"로드 시간 ({result['characters']}개 캐릭터)")
+        table.add_column("방식")
+        table.add_column("전체(ms)", justify="right")
+        table.add_column("캐릭터당(ms)", justify="right")
+        for label, key in (("폴더", "loose"), ("번들", "bundle")):
+            per_char = result[key] / result["characters"] if result["characters"] else 0.0
+            table.add_row(label, f"{result[key] * 1000:.1f}", f"{per_char * 1000:.3f}")
+        console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -42,12 +42,15 @@ def split_with_sam(image_path: Path, output_dir: Path) -> Dict[str, Any]:
     return {"success": False, "method": "sam"}
 
 
-def split_manual_template(image_path: Path, output_dir: Path) -> Dict[str, Any]:
-    """템플릿 기반 수동 분리 (폴백)"""
+def split_manual_template(image_path: Path, output_dir: Path, image=None) -> Dict[str, Any]:
+    """템플릿 기반 수동 분리 (폴백)
+
+    image: 이미 디코딩된 PIL 이미지 (있으면 파일을 다시 열지 않음)
+    """
     try:
         from PIL import Image
 
-        img = Image.open(image_path)
+        img = image if image is not None else Image.open(image_path)
         width, height = img.size
 
         # 간단한 그리드 기반 분리 (예시)
@@ -104,7 +107,7 @@ def main():
 
     if not image_path.exists():
         console.print(f"[red]파일을 찾을 수 없습니다: {image_path}[/red]")
-        return
+        raise SystemExit(1)
 
     console.print(f"[blue]입력: {image_path}[/blue]")
     console.print(f"[blue]방법: {args.method}[/blue]")
@@ -121,6 +124,7 @@ def main():
         console.print(f"[green]  파츠 수: {len(result.get('parts', []))}[/green]")
     else:
         console.print("[red]✗ 분리 실패[/red]")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+배치 실행 성능 계측 모듈
+
+- 하위 스크립트 프로세스별 wall/CPU 시간, 최대 RSS, 디스크 I/O 측정
+- 캐릭터 × 스테이지 단위 기록을 JSON Lines로 저장
+- 스테이지별 p50/p95/max 요약 표 및 Prometheus textfile 출력
+- 하위 스크립트는 emit()으로 SD 지연 시간 등 추가 지표를 보고
+
+사용법:
+    python telemetry.py --input telemetry.jsonl --prometheus batch.prom
+    python telemetry.py --profile-run out/prefix script.py [args...]   (내부용)
+"""
+
+import argparse
+import cProfile
+import json
+import math
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# 하위 스크립트가 stdout으로 지표를 보고할 때 쓰는 접두어
+TELEMETRY_PREFIX = "@@telemetry "
+TELEMETRY_ENV = "SPINE_TELEMETRY"
+
+# 기록마다 남기는 실행 ID (워커 프로세스에도 전달되도록 환경 변수 사용)
+RUN_ID_ENV = "SPINE_RUN_ID"
+
+# 한 스크립트 안에서 여러 번 emit되면 합산하는 지표 (재시도마다 SD 지연이 쌓임)
+SUMMED_METRICS = ("sd_latency",)
+
+# 요약 대상 지표 (기록 키, 표시 이름)
+SUMMARY_FIELDS = [
+    ("wall_time", "wall(s)"),
+    ("cpu_time", "cpu(s)"),
+    ("max_rss_bytes", "rss(MB)"),
+    ("sd_latency", "SD(s)"),
+]
+
+# ru_inblock / ru_oublock 단위 (512바이트 블록)
+BLOCK_SIZE = 512
+
+
+def emit(**metrics: Any) -> None:
+    """하위 스크립트에서 추가 지표 보고 (batch_generate가 수집)"""
+    if os.environ.get(TELEMETRY_ENV):
+        print(TELEMETRY_PREFIX + json.dumps(metrics), flush=True)
+
+
+def parse_emitted(stdout: str) -> Dict[str, Any]:
+    """stdout에서 emit()된 지표 추출 (SUMMED_METRICS는 합산, 나머지는 마지막 값)"""
+    metrics: Dict[str, Any] = {}
+    for line in stdout.splitlines():
+        if line.startswith(TELEMETRY_PREFIX):
+            try:
+                emitted = json.loads(line[len(TELEMETRY_PREFIX):])
+            except json.JSONDecodeError:
+                continue
+            for key, value in emitted.items():
+                if key in SUMMED_METRICS and key in metrics:
+                    metrics[key] += value
+                else:
+                    metrics[key] = value
+    return metrics
+
+
+def _rss_bytes(ru_maxrss: int) -> int:
+    """ru_maxrss 단위 보정 (macOS는 바이트, 그 외는 KB)"""
+    return ru_maxrss if sys.platform == "darwin" else ru_maxrss * 1024
+
+
+def run_measured(cmd: List[str], timeout: float,
+                 env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """하위 프로세스 실행 및 자원 사용량 측정
+
+    os.wait4가 있으면 해당 자식 프로세스만의 rusage를 얻는다.
+    출력은 파이프 대신 임시 파일로 받아 버퍼가 차서 멈추는 일을 막는다.
+    """
+    result: Dict[str, Any] = {"returncode": None, "timed_out": False}
+
+    with tempfile.TemporaryFile() as out_file, tempfile.TemporaryFile() as err_file:
+        started = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=out_file, stderr=err_file, env=env)
+
+        if hasattr(os, "wait4"):
+            waited: List[Any] = []
+            waiter = threading.Thread(target=lambda: waited.append(os.wait4(proc.pid, 0)),
+                                      daemon=True)
+            waiter.start()
+            waiter.join(timeout)
+            if waiter.is_alive():
+                proc.kill()
+                waiter.join()
+                result["timed_out"] = True
+            _, status, rusage = waited[0]
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            result.update({
+                "cpu_user": rusage.ru_utime,
+                "cpu_system": rusage.ru_stime,
+                "cpu_time": rusage.ru_utime + rusage.ru_stime,
+                "max_rss_bytes": _rss_bytes(rusage.ru_maxrss),
+                "bytes_read": rusage.ru_inblock * BLOCK_SIZE,
+                "bytes_written": rusage.ru_oublock * BLOCK_SIZE,
+            })
+        else:
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                result["timed_out"] = True
+
+        result["wall_time"] = time.perf_counter() - started
+        result["returncode"] = proc.returncode
+
+        out_file.seek(0)
+        err_file.seek(0)
+        result["stdout"] = out_file.read().decode("utf-8", errors="replace")
+        result["stderr"] = err_file.read().decode("utf-8", errors="replace")
+
+    result.update(parse_emitted(result["stdout"]))
+    return result
+
+
+def new_run_id() -> str:
+    """실행 ID (같은 기록 파일에 여러 실행이 쌓여도 구분)"""
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+
+class TelemetryWriter:
+    """JSON Lines 기록기 (여러 워커 프로세스가 같은 파일에 추가해도 줄 단위로 안전)
+
+    run_id를 주지 않으면 RUN_ID_ENV 환경 변수 값을 기록에 남긴다.
+    """
+
+    def __init__(self, path: Path, run_id: Optional[str] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id or os.environ.get(RUN_ID_ENV)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        record = {"ts": time.time(), "pid": os.getpid(), **record}
+        if self.run_id:
+            record.setdefault("run_id", self.run_id)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        # 한 번의 write로 추가해야 다른 프로세스 기록과 섞이지 않는다
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def load_records(path: Path, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """JSON Lines 기록 로드 (run_id를 주면 해당 실행 기록만)"""
+    records = []
+    if not path.exists():
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if run_id is None or record.get("run_id") == run_id:
+                    records.append(record)
+    return records
+
+
+def last_run_id(records: Iterable[Dict[str, Any]]) -> Optional[str]:
+    """가장 마지막에 기록된 실행 ID"""
+    run_id = None
+    for record in records:
+        run_id = record.get("run_id", run_id)
+    return run_id
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """최근접 순위 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """스테이지별 요약 (count, failures, cache_hits, 지표별 p50/p95/max/sum)"""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        stage = stages.setdefault(record.get("stage", "unknown"), {
+            "count": 0, "failures": 0, "cache_hits": 0, "retries": 0, "values": {},
+        })
+        stage["count"] += 1
+        if record.get("status") == "failed":
+            stage["failures"] += 1
+        if record.get("cache_hit"):
+            stage["cache_hits"] += 1
+        stage["retries"] += record.get("sd_retries", 0) or 0
+        for field, _ in SUMMARY_FIELDS:
+            value = record.get(field)
+            if value is not None:
+                stage["values"].setdefault(field, []).append(value)
+
+    for stage in stages.values():
+        values = stage.pop("values")
+        for field, _ in SUMMARY_FIELDS:
+            series = values.get(field, [])
+            stage[field] = {
+                "p50": percentile(series, 50),
+                "p95": percentile(series, 95),
+                "max": max(series) if series else 0.0,
+                "sum": sum(series),
+                "count": len(series),
+            }
+    return stages
+
+
+def character_totals(records: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """캐릭터별 총 wall 시간"""
+    totals: Dict[str, float] = {}
+    for record in records:
+        char_id = record.get("character_id")
+        if char_id is not None:
+            totals[char_id] = totals.get(char_id, 0.0) + (record.get("wall_time") or 0.0)
+    return totals
+
+
+def _format_value(field: str, value: float) -> str:
+    if field == "max_rss_bytes":
+        return f"{value / (1024 * 1024):.1f}"
+    return f"{value:.2f}"
+
+
+def print_summary(summary: Dict[str, Dict[str, Any]]) -> None:
+    """요약 표 출력"""
+    table = Table(title="스테이지별 성능 (p50 / p95 / max)")
+    table.add_column("스테이지")
+    table.add_column("횟수", justify="right")
+    table.add_column("실패", justify="right")
+    table.add_column("캐시", justify="right")
+    table.add_column("재시도", justify="right")
+    for _, label in SUMMARY_FIELDS:
+        table.add_column(label, justify="right")
+
+    for name, stage in summary.items():
+        cells = []
+        for field, _ in SUMMARY_FIELDS:
+            stats = stage[field]
+            if not stats["count"]:
+                cells.append("-")
+                continue
+            cells.append(" / ".join(_format_value(field, stats[k])
+                                    for k in ("p50", "p95", "max")))
+        table.add_row(name, str(stage["count"]), str(stage["failures"]),
+                      str(stage["cache_hits"]), str(stage["retries"]), *cells)
+    console.print(table)
+
+
+def write_prometheus(summary: Dict[str, Dict[str, Any]], path: Path) -> None:
+    """node_exporter textfile collector 형식으로 저장 (임시 파일 후 교체)"""
+    lines = []
+    metric_names = {
+        "wall_time": "spine_batch_stage_wall_seconds",
+        "cpu_time": "spine_batch_stage_cpu_seconds",
+        "max_rss_bytes": "spine_batch_stage_max_rss_bytes",
+        "sd_latency": "spine_batch_sd_latency_seconds",
+    }
+    for field, metric in metric_names.items():
+        lines.append(f"# TYPE {metric} summary")
+        for name, stage in summary.items():
+            stats = stage[field]
+            if not stats["count"]:
+                continue
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("1", "max")):
+                lines.append(f'{metric}{{stage="{name}",quantile="{quantile}"}} {stats[key]}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {stats["sum"]}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {stats["count"]}')
+
+    for key, metric in (("failures", "spine_batch_stage_failures_total"),
+                        ("cache_hits", "spine_batch_stage_cache_hits_total"),
+                        ("retries", "spine_batch_stage_retries_total")):
+        lines.append(f"# TYPE {metric} counter")
+        for name, stage in summary.items():
+            lines.append(f'{metric}{{stage="{name}"}} {stage[key]}')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def profile_command(prefix: Path, script_path: Path, args: List[str]) -> List[str]:
+    """프로파일러를 거쳐 스크립트를 실행하는 명령 생성"""
+    return [sys.executable, str(Path(__file__).resolve()), "--profile-run",
+            str(prefix), str(script_path)] + args
+
+
+def profile_run(prefix: Path, script_path: Path, args: List[str]) -> None:
+    """cProfile + tracemalloc 아래에서 스크립트 실행
+
+    <prefix>.prof (cProfile) 와 <prefix>.tracemalloc (스냅샷) 을 남긴다.
+    """
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    sys.argv = [str(script_path)] + args
+    sys.path[0] = str(script_path.parent)
+
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        runpy.run_path(str(script_path), run_name="__main__")
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(prefix) + ".prof")
+        tracemalloc.take_snapshot().dump(str(prefix) + ".tracemalloc")
+        tracemalloc.stop()
+
+
+def main():
+    if len(sys.argv) > 3 and sys.argv[1] == "--profile-run":
+        profile_run(Path(sys.argv[2]), Path(sys.argv[3]), sys.argv[4:])
+        return
+
+    parser = argparse.ArgumentParser(description="배치 성능 기록 요약")
+    parser.add_argument("--input", type=str, required=True, help="telemetry JSON Lines 경로")
+    parser.add_argument("--prometheus", type=str, help="Prometheus textfile 저장 경로")
+    parser.add_argument("--slowest", type=int, default=10, help="느린 캐릭터 표시 개수")
+    parser.add_argument("--run", type=str,
+                        help="요약할 실행 ID ('last'면 마지막 실행, 기본: 전체 기록)")
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        console.print(f"[red]파일을 찾을 수 없습니다: {input_path}[/red]")
+        return
+
+    records = load_records(input_path)
+    if args.run:
+        run_id = last_run_id(records) if args.run == "last" else args.run
+        records = [r for r in records if r.get("run_id") == run_id]
+        console.print(f"[blue]실행 ID: {run_id} ({len(records)}개 기록)[/blue]")
+    summary = summarize(records)
+    print_summary(summary)
+
+    totals = character_totals(records)
+    slowest = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.slowest]
+    if slowest:
+        console.print("[blue]느린 캐릭터: " + ", ".join(
+            f"{char_id} ({seconds:.1f}s)" for char_id, seconds in slowest) + "[/blue]")
+
+    if args.prometheus:
+        write_prometheus(summary, Path(args.prometheus))
+        console.print(f"[blue]Prometheus 저장: {args.prometheus}[/blue]")
+
+
+if __name__ == "__main__":
+    main()
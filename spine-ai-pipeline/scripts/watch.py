@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+상주 감시 모드 (watch)
+
+로스터 파일, 캐릭터별 config.json, config/presets.json을 감시하다가
+바뀐 필드/프리셋 섹션이 영향을 주는 스테이지부터 다시 실행한다.
+스테이지는 하위 프로세스 대신 상주 워커 스레드에서 실행하므로
+인터프리터 시작, 프리셋 파싱, SD 연결 수립, 일러스트 디코딩 비용을 매번 내지 않는다.
+
+- Linux에서는 inotify(ctypes), 그 외에는 mtime 폴링으로 변경을 감지한다.
+- 연속 저장은 debounce 시간 동안 모아 한 번만 처리한다.
+- 실행 중인 캐릭터가 또 바뀌면 끝난 뒤 필요한 스테이지부터 한 번 더 실행한다.
+
+사용법:
+    python watch.py --input characters.jsonl --output output/
+    python watch.py --input characters.csv --workers 2 --debounce 1.0 --initial
+    python batch_generate.py --input characters.jsonl --watch
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import requests
+from rich.console import Console
+
+from animate_character import add_animations_to_spine
+from batch_generate import STAGE_FAILED, STAGE_OK, STAGE_SKIPPED, STAGES, write_config
+from gen_illustration import generate_prompt, request_image
+from rig_character import generate_local
+from roster import iter_characters
+from split_parts import split_manual_template
+from telemetry import TelemetryWriter, new_run_id
+
+console = Console()
+
+STAGE_NAMES = [name for name, _, _ in STAGES]
+
+DEFAULT_PRESETS = Path(__file__).parent.parent / "config" / "presets.json"
+CONFIG_NAME = "config.json"
+
+# 캐릭터 필드 → 다시 실행할 첫 스테이지
+# 목록에 없는 필드(메모 등)는 생성 결과에 쓰이지 않으므로 재실행하지 않는다.
+FIELD_STAGES = {
+    "style": "illustration",
+    "description": "illustration",
+    "emotion": "illustration",
+    "steps": "illustration",
+    "width": "illustration",
+    "height": "illustration",
+    "cfg_scale": "illustration",
+    "sampler": "illustration",
+    "rig_type": "rig",
+    "animation_preset": "animate",
+}
+
+# presets.json 섹션 → (첫 스테이지, 캐릭터 필드, 필드 기본값)
+# output_settings는 export 단계에서만, styles는 어느 스테이지에서도 읽지 않으므로 감시 대상이 아니다
+# (일러스트 프롬프트는 캐릭터의 style 필드만 쓴다).
+PRESET_STAGES = {
+    "rig_types": ("rig", "rig_type", "humanoid"),
+    "animations": ("animate", "animation_preset", "combat"),
+}
+
+# 디코딩된 일러스트 캐시 크기 (캐릭터 수)
+IMAGE_CACHE_SIZE = 64
+
+# inotify 이벤트 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def load_presets(presets_path: Path) -> Dict[str, Any]:
+    """프리셋 로드 (없거나 저장 중이라 깨져 있으면 빈 값)"""
+    try:
+        with open(presets_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _preset_key(character: Dict[str, Any], field: str, default: str) -> str:
+    """캐릭터 필드 값을 프리셋 키로 변환 (예: "pixel anime" → "pixel_anime")"""
+    value = str(character.get(field) or default)
+    return value.strip().replace(" ", "_").replace("-", "_")
+
+
+def field_stage(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[int]:
+    """바뀐 캐릭터 필드 중 가장 앞선 스테이지 인덱스 (영향 없으면 None)"""
+    stages = [STAGE_NAMES.index(stage) for field, stage in FIELD_STAGES.items()
+              if old.get(field) != new.get(field)]
+    return min(stages) if stages else None
+
+
+def changed_preset_keys(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """섹션별로 값이 바뀐 프리셋 키"""
+    changed = {}
+    for section in PRESET_STAGES:
+        before, after = old.get(section, {}), new.get(section, {})
+        keys = {key for key in set(before) | set(after) if before.get(key) != after.get(key)}
+        if keys:
+            changed[section] = keys
+    return changed
+
+
+def preset_stage(character: Dict[str, Any], changed: Dict[str, Set[str]]) -> Optional[int]:
+    """바뀐 프리셋을 쓰는 캐릭터의 재실행 시작 스테이지 인덱스"""
+    stages = []
+    for section, keys in changed.items():
+        stage, field, default = PRESET_STAGES[section]
+        if _preset_key(character, field, default) in keys:
+            stages.append(STAGE_NAMES.index(stage))
+    return min(stages) if stages else None
+
+
+class WarmState:
+    """워커 스레드가 공유하는 상주 상태 (프리셋, SD 세션, 디코딩된 일러스트)"""
+
+    def __init__(self, presets: Dict[str, Any]):
+        self.presets = presets
+        self._local = threading.local()
+        self._images: "OrderedDict[Path, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """스레드별 HTTP 세션 (keep-alive 연결 재사용)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    @staticmethod
+    def _stat_key(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def put_image(self, path: Path, image: Any) -> None:
+        """방금 쓴 파일의 디코딩된 이미지를 캐시에 등록 (다음 스테이지가 다시 디코딩하지 않게)"""
+        key = self._stat_key(path)
+        with self._lock:
+            self._images[path] = (key, image)
+            self._images.move_to_end(path)
+            while len(self._images) > IMAGE_CACHE_SIZE:
+                self._images.popitem(last=False)
+
+    def image(self, path: Path):
+        """디코딩된 일러스트 (파일이 바뀌지 않았으면 캐시 사용)"""
+        from PIL import Image
+
+        key = self._stat_key(path)
+        with self._lock:
+            cached = self._images.get(path)
+            if cached and cached[0] == key:
+                self._images.move_to_end(path)
+                return cached[1]
+
+        with Image.open(path) as img:
+            img.load()
+            image = img.copy()
+        self.put_image(path, image)
+        return image
+
+
+def _status(success: bool) -> str:
+    return STAGE_OK if success else STAGE_FAILED
+
+
+def warm_illustration(character: Dict[str, Any], output_dir: Path,
+                      state: WarmState) -> Dict[str, Any]:
+    """일러스트 생성 (gen_illustration.py와 같은 프롬프트, 세션 재사용)
+
+    SD 응답을 여기서 한 번 디코딩해 캐시에 넣으므로 이어지는 split은 파일을 다시 읽지 않는다.
+    """
+    import io
+
+    from PIL import Image
+
+    char_dir = output_dir / character.get("character_id", "unknown")
+    image_data = request_image(generate_prompt(character), character, session=state.session)
+    if image_data is None:
+        return {"status": STAGE_FAILED}
+    illustration_path = char_dir / "illustration.png"
+    char_dir.mkdir(parents=True, exist_ok=True)
+    with open(illustration_path, "wb") as f:
+        f.write(image_data)
+    with Image.open(io.BytesIO(image_data)) as img:
+        img.load()
+        state.put_image(illustration_path, img.copy())
+    return {"status": STAGE_OK}
+
+
+def warm_split(character: Dict[str, Any], output_dir: Path,
+               state: WarmState) -> Dict[str, Any]:
+    """파츠 분리 (디코딩된 일러스트 재사용)"""
+    char_dir = output_dir / character.get("character_id", "unknown")
+    illustration_path = char_dir / "illustration.png"
+    if not illustration_path.exists():
+        return {"status": STAGE_SKIPPED}
+    result = split_manual_template(illustration_path, char_dir / "parts",
+                                   image=state.image(illustration_path))
+    return {"status": _status(result.get("success", False))}
+
+
+def warm_rig(character: Dict[str, Any], output_dir: Path,
+             state: WarmState) -> Dict[str, Any]:
+    """리깅 생성 (메모리의 프리셋 사용)"""
+    char_dir = output_dir / character.get("character_id", "unknown")
+    parts_dir = char_dir / "parts"
+    if not parts_dir.exists():
+        return {"status": STAGE_SKIPPED}
+    result = generate_local(parts_dir, char_dir / "spine",
+                            character.get("rig_type", "humanoid"), presets=state.presets)
+    return {"status": _status(result.get("success", False))}
+
+
+def warm_animate(character: Dict[str, Any], output_dir: Path,
+                 state: WarmState) -> Dict[str, Any]:
+    """애니메이션 재생성 (이전 프리셋의 애니메이션은 지움)"""
+    char_dir = output_dir / character.get("character_id", "unknown")
+    skeleton_path = char_dir / "spine" / "skeleton.json"
+    if not skeleton_path.exists():
+        return {"status": STAGE_SKIPPED}
+    preset = character.get("animation_preset", "combat")
+    animations = state.presets.get("animations", {}).get(preset, ["idle"])
+    result = add_animations_to_spine(skeleton_path, animations, replace=True)
+    return {"status": _status(result.get("success", False))}
+
+
+WARM_STAGES = {
+    "illustration": warm_illustration,
+    "split": warm_split,
+    "rig": warm_rig,
+    "animate": warm_animate,
+}
+
+
+class InotifyWatcher:
+    """inotify 기반 변경 감지 (디렉터리 단위로 감시해 원자적 저장(rename)도 잡는다)"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._dirs: Dict[int, Path] = {}
+
+    def add_dir(self, directory: Path) -> None:
+        if directory in self._dirs.values():
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._dirs[wd] = directory
+
+    def changes(self, timeout: float) -> Optional[Set[Path]]:
+        """timeout 동안 바뀐 경로 (이벤트 큐가 넘쳤으면 None → 전체 재확인)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        paths: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # 새 캐릭터 폴더: 감시를 건 뒤 이미 만들어진 config.json도 확인
+                    self.add_dir(path)
+                    paths.add(path / CONFIG_NAME)
+                continue
+            paths.add(path)
+        return paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """mtime/크기 폴링 기반 변경 감지 (inotify가 없을 때)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._dirs: List[Path] = []
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+
+    def add_dir(self, directory: Path) -> None:
+        if directory not in self._dirs:
+            self._dirs.append(directory)
+            self._snapshot.update(self._scan([directory]))
+
+    @staticmethod
+    def _scan(dirs: List[Path]) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for directory in dirs:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return snapshot
+
+    def changes(self, timeout: float) -> Optional[Set[Path]]:
+        time.sleep(self.interval)
+        snapshot = self._scan(self._dirs)
+        paths = {path for path in set(snapshot) | set(self._snapshot)
+                 if snapshot.get(path) != self._snapshot.get(path)}
+        self._snapshot = snapshot
+        return paths
+
+    def close(self) -> None:
+        pass
+
+
+class WatchSession:
+    """변경 감지 → 영향 스테이지 계산 → 상주 워커 실행"""
+
+    def __init__(self, roster_path: Path, output_dir: Path, presets_path: Path,
+                 workers: int = 1, debounce: float = 0.5, max_delay: float = 5.0,
+                 poll_interval: float = 1.0, force_polling: bool = False,
+                 telemetry: Optional[TelemetryWriter] = None):
+        self.roster_path = roster_path.resolve()
+        self.output_dir = output_dir.resolve()
+        self.presets_path = presets_path.resolve()
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.telemetry = telemetry
+
+        self.state = WarmState(load_presets(self.presets_path))
+        self.characters: Dict[str, Dict[str, Any]] = {}
+        # 로스터 변경은 config.json이 아니라 직전 로스터 행과 비교한다
+        self.roster_rows: Dict[str, Dict[str, Any]] = {}
+        self.pending: Dict[str, int] = {}
+        self.running: Dict[str, Future] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers,
+                                           thread_name_prefix="watch-worker")
+
+        self.watcher = None
+        if not force_polling:
+            try:
+                self.watcher = InotifyWatcher()
+            except (OSError, AttributeError) as e:
+                console.print(f"[yellow]inotify 사용 불가, 폴링으로 전환: {e}[/yellow]")
+        if self.watcher is None:
+            self.watcher = PollingWatcher(poll_interval)
+
+    def _config_path(self, char_id: str) -> Path:
+        return self.output_dir / char_id / CONFIG_NAME
+
+    def _read_config(self, char_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._config_path(char_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _read_roster(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            return {str(c.get("character_id", "unknown")): c
+                    for c in iter_characters(self.roster_path)}
+        except (OSError, ValueError) as e:
+            # 편집기가 저장하는 도중이면 다음 이벤트에서 다시 읽는다
+            console.print(f"[yellow]로스터 읽기 실패: {e}[/yellow]")
+            return None
+
+    def schedule(self, char_id: str, stage_index: int, reason: str) -> None:
+        previous = self.pending.get(char_id)
+        self.pending[char_id] = stage_index if previous is None else min(previous, stage_index)
+        console.print(f"[blue]{char_id}: {reason} → {STAGE_NAMES[stage_index]}부터[/blue]")
+
+    def start(self, initial: bool) -> None:
+        """현재 상태 로드 및 감시 시작"""
+        roster = self._read_roster() or {}
+        self.roster_rows = roster
+        for char_id, character in roster.items():
+            config = self._read_config(char_id)
+            if config is None:
+                write_config(character, self.output_dir)
+                config = character
+            # 마지막으로 실행된(또는 아티스트가 고친) config.json을 현재 상태로 본다
+            self.characters[char_id] = config
+            if initial and not (self.output_dir / char_id / "spine").exists():
+                self.schedule(char_id, 0, "출력 없음")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for directory in {self.roster_path.parent, self.presets_path.parent, self.output_dir}:
+            self.watcher.add_dir(directory)
+        for char_id in self.characters:
+            self.watcher.add_dir(self.output_dir / char_id)
+
+        console.print(f"[green][OK] Watching {len(self.characters)} characters "
+                      f"({type(self.watcher).__name__})[/green]")
+
+    def apply_changes(self, paths: Optional[Set[Path]]) -> None:
+        """모인 변경을 한 번에 반영 (None이면 전체 재확인)"""
+        if paths is None:
+            paths = {self.roster_path, self.presets_path}
+            paths.update(self._config_path(char_id) for char_id in self.characters)
+
+        if self.presets_path in paths:
+            presets = load_presets(self.presets_path)
+            changed = changed_preset_keys(self.state.presets, presets) if presets else {}
+            if presets:
+                self.state.presets = presets
+            for char_id, character in self.characters.items():
+                stage = preset_stage(character, changed)
+                if stage is not None:
+                    self.schedule(char_id, stage, "프리셋 변경")
+
+        if self.roster_path in paths:
+            roster = self._read_roster()
+            for char_id, row in (roster or {}).items():
+                previous = self.characters.get(char_id)
+                if previous is None:
+                    self.characters[char_id] = row
+                    write_config(row, self.output_dir)
+                    self.watcher.add_dir(self.output_dir / char_id)
+                    self.schedule(char_id, 0, "새 캐릭터")
+                    continue
+                # 로스터에서 바뀐 필드만 반영해 아티스트가 고친 config.json 값은 유지
+                before = self.roster_rows.get(char_id, {})
+                character = dict(previous)
+                for field in set(before) | set(row):
+                    if before.get(field) == row.get(field):
+                        continue
+                    if field in row:
+                        character[field] = row[field]
+                    else:
+                        character.pop(field, None)
+                if character != previous:
+                    self.characters[char_id] = character
+                    write_config(character, self.output_dir)
+                    stage = field_stage(previous, character)
+                    if stage is not None:
+                        self.schedule(char_id, stage, "로스터 변경")
+            if roster is not None:
+                self.roster_rows = roster
+
+        for path in paths:
+            if path.name != CONFIG_NAME or path.parent.parent != self.output_dir:
+                continue
+            char_id = path.parent.name
+            previous = self.characters.get(char_id)
+            config = self._read_config(char_id)
+            if previous is None or config is None or config == previous:
+                continue  # 로스터 밖 폴더, 저장 중, 또는 직접 쓴 내용
+            self.characters[char_id] = config
+            stage = field_stage(previous, config)
+            if stage is not None:
+                self.schedule(char_id, stage, "config.json 변경")
+
+    def run_character(self, character: Dict[str, Any], stage_index: int) -> None:
+        """워커 스레드: 지정 스테이지부터 끝까지 실행"""
+        char_id = character.get("character_id", "unknown")
+        for stage in STAGE_NAMES[stage_index:]:
+            started = time.perf_counter()
+            try:
+                result = WARM_STAGES[stage](character, self.output_dir, self.state)
+            except Exception as e:
+                result = {"status": STAGE_FAILED, "error": str(e)}
+            result["wall_time"] = time.perf_counter() - started
+            color = "green" if result["status"] != STAGE_FAILED else "red"
+            console.print(f"[{color}]  {char_id} / {stage}: {result['status']} "
+                          f"({result['wall_time']:.2f}s)[/{color}]")
+            if self.telemetry:
+                self.telemetry.write({"character_id": char_id, "stage": stage,
+                                      "watch": True, **result})
+
+    def dispatch(self) -> None:
+        """끝난 실행 정리 후 대기 중인 캐릭터 제출 (같은 캐릭터는 동시에 실행하지 않음)"""
+        for char_id, future in list(self.running.items()):
+            if future.done():
+                del self.running[char_id]
+                if future.exception():
+                    console.print(f"[red]{char_id}: {future.exception()}[/red]")
+
+        for char_id in [cid for cid in self.pending if cid not in self.running]:
+            stage_index = self.pending.pop(char_id)
+            character = dict(self.characters[char_id])
+            self.running[char_id] = self.executor.submit(self.run_character,
+                                                         character, stage_index)
+
+    def loop(self) -> None:
+        """변경 대기 → debounce → 반영 → 실행 (Ctrl+C로 종료)"""
+        dirty: Set[Path] = set()
+        rescan = False
+        first_event = last_event = 0.0
+        try:
+            while True:
+                self.dispatch()
+                paths = self.watcher.changes(timeout=0.1 if dirty or rescan else 0.5)
+                now = time.monotonic()
+                if paths is None or paths:
+                    if not dirty and not rescan:
+                        first_event = now
+                    last_event = now
+                    if paths is None:
+                        rescan = True
+                    else:
+                        dirty |= paths
+
+                if (dirty or rescan) and (now - last_event >= self.debounce
+                                          or now - first_event >= self.max_delay):
+                    self.apply_changes(None if rescan else dirty)
+                    dirty, rescan = set(), False
+        except KeyboardInterrupt:
+            console.print("[yellow]감시 종료 (실행 중인 작업 완료 대기)[/yellow]")
+        finally:
+            self.executor.shutdown(wait=True)
+            self.watcher.close()
+
+
+def run_watch(roster_path: Path, output_dir: Path, presets_path: Path = DEFAULT_PRESETS,
+              workers: int = 1, debounce: float = 0.5, poll_interval: float = 1.0,
+              force_polling: bool = False, initial: bool = False,
+              telemetry_path: Optional[Path] = None) -> None:
+    """감시 모드 실행 (batch_generate.py --watch 에서도 사용)"""
+    telemetry = TelemetryWriter(telemetry_path, new_run_id()) if telemetry_path else None
+    session = WatchSession(roster_path, output_dir, presets_path, workers=workers,
+                           debounce=debounce, poll_interval=poll_interval,
+                           force_polling=force_polling, telemetry=telemetry)
+    session.start(initial)
+    session.loop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="변경 감시 후 영향받는 스테이지만 재실행")
+    parser.add_argument("--input", type=str, required=True,
+                        help="캐릭터 목록 파일 (CSV, JSON 또는 JSON Lines)")
+    parser.add_argument("--output", type=str, default="output", help="출력 경로")
+    parser.add_argument("--presets", type=str, default=str(DEFAULT_PRESETS),
+                        help="프리셋 파일 경로")
+    parser.add_argument("--workers", type=int, default=1, help="상주 워커 스레드 수")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="마지막 변경 후 이 시간(초) 동안 조용하면 실행")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="폴링 모드의 확인 간격(초)")
+    parser.add_argument("--polling", action="store_true", help="inotify 대신 폴링 사용")
+    parser.add_argument("--initial", action="store_true",
+                        help="시작 시 출력이 없는 캐릭터를 전체 실행")
+    parser.add_argument("--telemetry", type=str, help="스테이지별 성능 기록 JSON Lines 경로")
+    args = parser.parse_args()
+
+    roster_path = Path(args.input)
+    if not roster_path.exists():
+        console.print(f"[red]파일을 찾을 수 없습니다: {roster_path}[/red]")
+        return
+
+    run_watch(roster_path, Path(args.output), Path(args.presets), workers=args.workers,
+              debounce=args.debounce, poll_interval=args.poll_interval,
+              force_polling=args.polling, initial=args.initial,
+              telemetry_path=Path(args.telemetry) if args.telemetry else None)
+
+
+if __name__ == "__main__":
+    main()
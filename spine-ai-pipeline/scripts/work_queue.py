@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+SQLite 기반 배치 작업 큐
+
+캐릭터 × 스테이지 단위 작업을 하나의 SQLite 파일에 저장하고,
+여러 워커 프로세스가 임대(lease)를 걸어 가져가도록 한다.
+
+- 같은 캐릭터의 스테이지는 앞 스테이지가 끝난 뒤에만 할당된다
+- 워커는 하트비트로 임대를 연장하며, 만료된 임대는 자동으로 재할당된다
+- 실패한 스테이지는 max_attempts 까지 재시도된다
+- 큐 파일이 남아 있으므로 중단된 배치는 같은 명령으로 이어서 실행된다
+
+사용법:
+    python work_queue.py --queue queue.db            # 상태 조회
+    python work_queue.py --queue queue.db --retry-failed
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# 작업 상태
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# 새 큐 파일의 저널 모드 (여러 호스트가 공유 파일시스템으로 쓰면 delete)
+DEFAULT_JOURNAL_MODE = "wal"
+
+# 다음 스테이지로 넘어갈 수 있는 상태
+TERMINAL_STATES = (DONE, FAILED, SKIPPED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    character_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    character_id TEXT NOT NULL REFERENCES characters(character_id),
+    stage TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (character_id, stage)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, character_id, seq);
+"""
+
+
+class WorkQueue:
+    """SQLite 작업 큐"""
+
+    def __init__(self, db_path: Path, lease_seconds: float = 60.0,
+                 journal_mode: Optional[str] = None):
+        """journal_mode: 지정하면 큐 파일에 설정, None이면 저장된 모드 유지 (새 큐는 wal)
+
+        저널 모드는 파일에 남는 설정이므로 워커가 연결할 때마다 덮어쓰지 않는다.
+        """
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        if journal_mode is None and not self.db_path.exists():
+            journal_mode = DEFAULT_JOURNAL_MODE
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = self._connect()
+        if journal_mode:
+            self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.journal_mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """연결 생성 (트랜잭션은 직접 관리)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def _transaction(self, conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+        """쓰기 잠금을 먼저 잡는 트랜잭션"""
+        conn = conn or self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def enqueue(self, character: Dict[str, Any], stages: List[Tuple[str, int]]) -> bool:
+        """캐릭터와 스테이지 작업 적재 (이미 있으면 False)
+
+        stages: (스테이지 이름, 최대 시도 횟수) 목록, 실행 순서대로
+        """
+        char_id = str(character.get("character_id", "unknown"))
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO characters (character_id, payload) VALUES (?, ?)",
+                (char_id, json.dumps(character, ensure_ascii=False)),
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (character_id, stage, seq, max_attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(char_id, stage, seq, max_attempts, now)
+                 for seq, (stage, max_attempts) in enumerate(stages)],
+            )
+        return True
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """임대가 만료된 작업을 대기 상태로 되돌림 (시도 횟수 초과 시 실패 처리)"""
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+            "worker = NULL, lease_expires = NULL, error = 'lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (FAILED, PENDING, now, RUNNING, now),
+        )
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """실행 가능한 작업 하나를 임대"""
+        now = time.time()
+        placeholders = ", ".join("?" for _ in TERMINAL_STATES)
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT j.id, j.character_id, j.stage, j.attempts, j.max_attempts, c.payload "
+                "FROM jobs j JOIN characters c ON c.character_id = j.character_id "
+                "WHERE j.status = ? AND NOT EXISTS ("
+                "  SELECT 1 FROM jobs p WHERE p.character_id = j.character_id "
+                f"  AND p.seq < j.seq AND p.status NOT IN ({placeholders})) "
+                "ORDER BY j.id LIMIT 1",
+                (PENDING, *TERMINAL_STATES),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+
+        return {
+            "id": row["id"],
+            "character_id": row["character_id"],
+            "stage": row["stage"],
+            "attempts": row["attempts"] + 1,
+            "max_attempts": row["max_attempts"],
+            "character": json.loads(row["payload"]),
+        }
+
+    def renew(self, job_id: int, worker_id: str,
+              conn: Optional[sqlite3.Connection] = None) -> bool:
+        """임대 연장 (이미 다른 워커에게 넘어갔으면 False)"""
+        now = time.time()
+        conn = conn or self.conn
+        cursor = conn.execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (now + self.lease_seconds, now, job_id, worker_id, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def heartbeat(self, job_id: int, worker_id: str) -> Iterator[None]:
+        """작업 실행 중 백그라운드 스레드로 임대를 주기적으로 연장"""
+        stop = threading.Event()
+
+        def beat() -> None:
+            # sqlite 연결은 스레드 간 공유하지 않는다
+            conn = self._connect()
+            try:
+                while not stop.wait(self.lease_seconds / 3):
+                    if not self.renew(job_id, worker_id, conn):
+                        console.print(f"[yellow]임대 상실: job {job_id}[/yellow]")
+                        return
+            finally:
+                conn.close()
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job_id: int, worker_id: str, status: str,
+                 error: Optional[str] = None) -> str:
+        """작업 결과 기록, 최종 상태 반환
+
+        status: "ok" / "failed" / "skipped" (batch_generate 스테이지 결과)
+        실패했지만 시도 횟수가 남아 있으면 다시 대기 상태가 된다.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (job_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                # 임대가 만료되어 이미 재할당됨 - 결과 무시
+                return PENDING
+
+            if status == "ok":
+                new_status = DONE
+            elif status == "skipped":
+                new_status = SKIPPED
+            elif row["attempts"] < row["max_attempts"]:
+                new_status = PENDING
+            else:
+                new_status = FAILED
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, "
+                "error = ?, updated_at = ? WHERE id = ?",
+                (new_status, error, now, job_id),
+            )
+        return new_status
+
+    def retry_failed(self) -> int:
+        """실패한 작업을 다시 대기 상태로 (시도 횟수 초기화)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, error = NULL, updated_at = ? "
+                "WHERE status = ?",
+                (PENDING, time.time(), FAILED),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def stage_counts(self) -> Dict[str, Dict[str, int]]:
+        """스테이지별 상태 작업 수"""
+        result: Dict[str, Dict[str, int]] = {}
+        rows = self.conn.execute(
+            "SELECT stage, status, COUNT(*) AS n FROM jobs "
+            "GROUP BY stage, status ORDER BY MIN(seq)"
+        ).fetchall()
+        for row in rows:
+            result.setdefault(row["stage"], {})[row["status"]] = row["n"]
+        return result
+
+    def is_drained(self) -> bool:
+        """대기/실행 중인 작업이 없는지 확인"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (PENDING, RUNNING)
+        ).fetchone()
+        return row[0] == 0
+
+    def character_results(self) -> Dict[str, Dict[str, Any]]:
+        """캐릭터별 결과 (batch_generate 요약 형식)"""
+        results: Dict[str, Dict[str, Any]] = {}
+        rows = self.conn.execute(
+            "SELECT character_id, stage, status, attempts FROM jobs ORDER BY character_id, seq"
+        ).fetchall()
+        for row in rows:
+            entry = results.setdefault(row["character_id"], {"status": "success", "stages": {}})
+            entry["stages"][row["stage"]] = {"status": row["status"], "attempts": row["attempts"]}
+            if row["status"] == FAILED:
+                entry["status"] = "failed"
+            elif row["status"] in (PENDING, RUNNING) and entry["status"] != "failed":
+                entry["status"] = "pending"
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 큐 상태 조회")
+    parser.add_argument("--queue", type=str, required=True, help="SQLite 큐 경로")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="실패한 작업을 다시 대기 상태로")
+    args = parser.parse_args()
+
+    queue_path = Path(args.queue)
+    if not queue_path.exists():
+        console.print(f"[red]큐를 찾을 수 없습니다: {queue_path}[/red]")
+        return
+
+    queue = WorkQueue(queue_path)
+
+    if args.retry_failed:
+        console.print(f"[green]재시도 대기: {queue.retry_failed()}개 작업[/green]")
+
+    statuses = [PENDING, RUNNING, DONE, SKIPPED, FAILED]
+    table = Table(title=str(queue_path))
+    table.add_column("스테이지")
+    for status in statuses:
+        table.add_column(status, justify="right")
+    for stage, counts in queue.stage_counts().items():
+        table.add_row(stage, *(str(counts.get(s, 0)) for s in statuses))
+    console.print(table)
+
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()